@@ -0,0 +1,52 @@
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from utils.csv_parser import CSVProcessor
+
+
+def write_rows(csv_file, rows: int) -> None:
+    start = date(2020, 1, 31)
+    for row in range(rows):
+        employee_id = f"E{row % 5000:05d}"
+        event_date = start + timedelta(days=30 * (row % 48))
+        csv_file.write(f"VEST,{employee_id},Employee {employee_id},AWD-{row % 20000:06d},"
+                       f"{event_date.isoformat()},{100 + row % 900}.125\n")
+
+
+def time_parse(processor: CSVProcessor, file_path: str, precision: int, use_parallel: bool) -> float:
+    started = time.perf_counter()
+    if use_parallel:
+        processor.parallel_process_csv(file_path, precision)
+    else:
+        for _ in processor.stream_parse_csv(file_path, precision):
+            pass
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure CSVProcessor parse throughput')
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--precision', type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as csv_file:
+        write_rows(csv_file, args.rows)
+
+    try:
+        for label, compact, use_parallel in [
+            ("stream/records", True, False),
+            ("stream/pydantic", False, False),
+            ("parallel/records", True, True),
+        ]:
+            processor = CSVProcessor(compact_events=compact)
+            elapsed = time_parse(processor, csv_file.name, args.precision, use_parallel)
+            print(f"{label:<18} seconds={elapsed:.3f} rows_per_second={args.rows / elapsed:,.0f}")
+    finally:
+        os.unlink(csv_file.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import List
+
+from models.event import Event, EventType
+from services.vesting_service import VestingService
+
+
+def build_events(awards: int, events_per_award: int) -> List[Event]:
+    events = []
+    start = date(2020, 1, 1)
+    for award_number in range(awards):
+        employee_id = f"E{award_number // 4:05d}"
+        for event_number in range(events_per_award):
+            events.append(Event(
+                event_type=EventType.VEST,
+                employee_id=employee_id,
+                employee_name=f"Employee {employee_id}",
+                award_id=f"AWD-{award_number:06d}",
+                event_date=start + timedelta(days=30 * event_number),
+                quantity=Decimal(100 + event_number)
+            ))
+    return events
+
+
+def time_process_events(events: List[Event], workers: int) -> float:
+    service = VestingService(use_parallel=workers > 1, max_workers=workers)
+    started = time.perf_counter()
+    service.process_events(events)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure VestingService.process_events scaling by worker count')
+    parser.add_argument('--awards', type=int, default=2000)
+    parser.add_argument('--events-per-award', type=int, default=48)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    events = build_events(args.awards, args.events_per_award)
+    baseline = None
+    for workers in args.workers:
+        elapsed = time_process_events(events, workers)
+        baseline = baseline or elapsed
+        print(f"workers={workers:<3} seconds={elapsed:.3f} speedup={baseline / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import random
+import sys
+from datetime import date, timedelta
+from typing import Iterator, List, TextIO, Tuple
+
+from models.event import EventType
+
+GeneratedRow = Tuple[EventType, str, str, str, date, str]
+
+FIRST_NAMES = ("Alice", "Bobby", "Cat", "Dev", "Erin", "Farah", "Gus", "Hana", "Ivan", "Jo")
+LAST_NAMES = ("Smith", "Jones", "Helms", "Patel", "Nguyen", "Garcia", "Okafor", "Berg", "Kim", "Rossi")
+AWARD_PREFIXES = ("ISO", "NSO", "RSU")
+
+
+def generate_rows(employees: int = 1000, awards_per_employee: int = 2, events_per_award: int = 24,
+                  start_date: date = date(2020, 1, 1), spread_days: int = 4 * 365,
+                  cancel_rate: float = 0.1, performance_rate: float = 0.05, decimals: int = 2,
+                  seed: int = 0) -> Iterator[GeneratedRow]:
+    rng = random.Random(seed)
+    scale = 10 ** decimals
+
+    for employee_number in range(employees):
+        employee_id = f"E{employee_number:06d}"
+        employee_name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+        for award_number in range(awards_per_employee):
+            award_id = f"{rng.choice(AWARD_PREFIXES)}-{employee_number:06d}-{award_number:02d}"
+            offsets = sorted(rng.randrange(spread_days) for _ in range(events_per_award))
+            whole_shares_vested = 0
+
+            for offset in offsets:
+                event_date = start_date + timedelta(days=offset)
+                roll = rng.random()
+
+                if roll < cancel_rate and whole_shares_vested > 1:
+                    quantity = rng.randint(1, whole_shares_vested // 2)
+                    whole_shares_vested -= quantity
+                    yield EventType.CANCEL, employee_id, employee_name, award_id, event_date, str(quantity)
+                elif roll < cancel_rate + performance_rate:
+                    multiplier = f"{rng.randint(100, 200) / 100:.2f}"
+                    yield EventType.PERFORMANCE, employee_id, employee_name, award_id, event_date, multiplier
+                else:
+                    units = rng.randint(10 * scale, 1000 * scale)
+                    whole_shares_vested += units // scale
+                    quantity = f"{units // scale}.{units % scale:0{decimals}d}" if decimals else str(units)
+                    yield EventType.VEST, employee_id, employee_name, award_id, event_date, quantity
+
+
+def write_csv(csv_file: TextIO, rows: Iterator[GeneratedRow], sort_by_date: bool = False) -> int:
+    if sort_by_date:
+        rows = sorted(rows, key=lambda row: row[4])
+
+    count = 0
+    block: List[str] = []
+    for event_type, employee_id, employee_name, award_id, event_date, quantity in rows:
+        block.append(f"{event_type},{employee_id},{employee_name},{award_id},{event_date.isoformat()},{quantity}")
+        if len(block) >= 8192:
+            csv_file.write("\n".join(block) + "\n")
+            count += len(block)
+            block.clear()
+    if block:
+        csv_file.write("\n".join(block) + "\n")
+        count += len(block)
+    return count
+
+
+def add_generator_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--employees', type=int, default=1000)
+    parser.add_argument('--awards-per-employee', type=int, default=2)
+    parser.add_argument('--events-per-award', type=int, default=24)
+    parser.add_argument('--start-date', type=date.fromisoformat, default=date(2020, 1, 1))
+    parser.add_argument('--spread-days', type=int, default=4 * 365)
+    parser.add_argument('--cancel-rate', type=float, default=0.1)
+    parser.add_argument('--performance-rate', type=float, default=0.05)
+    parser.add_argument('--decimals', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def generator_options(args: argparse.Namespace) -> dict:
+    return dict(
+        employees=args.employees, awards_per_employee=args.awards_per_employee,
+        events_per_award=args.events_per_award, start_date=args.start_date, spread_days=args.spread_days,
+        cancel_rate=args.cancel_rate, performance_rate=args.performance_rate, decimals=args.decimals,
+        seed=args.seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a deterministic synthetic vesting events CSV')
+    add_generator_arguments(parser)
+    parser.add_argument('--sort-by-date', action='store_true', help='Write rows in global date order')
+    parser.add_argument('--output', default=None, help='File to write (default: stdout)')
+    args = parser.parse_args()
+
+    rows = generate_rows(**generator_options(args))
+    if args.output is None:
+        write_csv(sys.stdout, rows, args.sort_by_date)
+    else:
+        with open(args.output, 'w') as csv_file:
+            write_csv(csv_file, rows, args.sort_by_date)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import date
+from typing import Callable, Dict, List
+
+from benchmarks.generator import add_generator_arguments, generate_rows, generator_options, write_csv
+from services.vesting_service import VestingService
+from utils.csv_parser import CSVProcessor
+from utils.date_utils import date_range
+
+SUITE_VERSION = 1
+
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def result(name: str, seconds: float, items: int, unit: str) -> Dict:
+    return {
+        "name": name,
+        "seconds": round(seconds, 6),
+        "items": items,
+        f"{unit}_per_second": round(items / seconds, 1) if seconds else None,
+    }
+
+
+def bench_parse(file_path: str, rows: int, precision: int, workers: int, chunk_size: int,
+                repeat: int) -> List[Dict]:
+    results = []
+    for name, compact in [("parse/stream/records", True), ("parse/stream/pydantic", False)]:
+        processor = CSVProcessor(chunk_size=chunk_size, compact_events=compact)
+        seconds = best_of(lambda: list(processor.stream_parse_csv(file_path, precision)), repeat)
+        results.append(result(name, seconds, rows, "rows"))
+
+    for executor in ("thread", "process"):
+        processor = CSVProcessor(chunk_size=chunk_size, max_workers=workers, executor=executor)
+        seconds = best_of(lambda: processor.parallel_process_csv(file_path, precision), repeat)
+        results.append(result(f"parse/parallel/{executor}", seconds, rows, "rows"))
+    return results
+
+
+def bench_process_events(events: List, workers: int, repeat: int) -> List[Dict]:
+    results = []
+    for name, options in [
+        ("process_events/serial", dict(use_parallel=False)),
+        ("process_events/parallel/thread", dict(use_parallel=True, max_workers=workers, executor="thread")),
+        ("process_events/parallel/process", dict(use_parallel=True, max_workers=workers, executor="process")),
+    ]:
+        seconds = best_of(lambda: VestingService(**options).process_events(events), repeat)
+        results.append(result(name, seconds, len(events), "events"))
+    return results
+
+
+def bench_schedules(events: List, target_dates: List[date], precision: int, workers: int,
+                    repeat: int) -> List[Dict]:
+    results = []
+    for name, options in [
+        ("serial", dict(use_parallel=False)),
+        ("parallel/thread", dict(use_parallel=True, max_workers=workers, executor="thread")),
+    ]:
+        def single_date():
+            service = VestingService(**options)
+            service.process_events(events)
+            started = time.perf_counter()
+            schedule = service.get_vesting_schedule(target_dates[-1], precision)
+            return time.perf_counter() - started, len(schedule)
+
+        def per_date():
+            service = VestingService(**options)
+            service.process_events(events)
+            started = time.perf_counter()
+            rows = sum(len(service.get_vesting_schedule(target_date, precision)) for target_date in target_dates)
+            return time.perf_counter() - started, rows
+
+        def many_dates():
+            service = VestingService(**options)
+            service.process_events(events)
+            started = time.perf_counter()
+            schedules = service.get_vesting_schedules(target_dates, precision)
+            return time.perf_counter() - started, sum(len(schedule) for schedule in schedules.values())
+
+        for label, run in [("single_date", single_date), ("per_date", per_date), ("many_dates", many_dates)]:
+            timings = [run() for _ in range(repeat)]
+            seconds, rows = min(timings)
+            results.append(result(f"schedule/{name}/{label}", seconds, rows, "rows"))
+    return results
+
+
+def run_suite(args: argparse.Namespace) -> Dict:
+    with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as csv_file:
+        rows = write_csv(csv_file, generate_rows(**generator_options(args)))
+
+    try:
+        results = bench_parse(csv_file.name, rows, args.precision, args.workers, args.chunk_size, args.repeat)
+        events = CSVProcessor().parallel_process_csv(csv_file.name, args.precision)
+    finally:
+        os.unlink(csv_file.name)
+
+    results += bench_process_events(events, args.workers, args.repeat)
+    end_date = max(event.event_date for event in events)
+    target_dates = date_range(args.start_date, end_date, args.step)
+    results += bench_schedules(events, target_dates, args.precision, args.workers, args.repeat)
+
+    return {
+        "suite_version": SUITE_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            **{key: value.isoformat() if isinstance(value, date) else value
+               for key, value in generator_options(args).items()},
+            "rows": rows,
+            "precision": args.precision,
+            "workers": args.workers,
+            "chunk_size": args.chunk_size,
+            "repeat": args.repeat,
+            "schedule_dates": len(target_dates),
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the parse, process and schedule benchmarks and emit JSON')
+    add_generator_arguments(parser)
+    parser.add_argument('--precision', type=int, default=2)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--step', default='month', help='Interval between schedule dates (default: month)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per benchmark; the fastest is reported')
+    parser.add_argument('--output', default=None, help='File to write the JSON report to (default: stdout)')
+    args = parser.parse_args()
+
+    report = run_suite(args)
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+from http import HTTPStatus
+
+
+class RequestError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
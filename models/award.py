@@ -1,14 +1,36 @@
 from datetime import date
 from decimal import Decimal
-from typing import List, Annotated, Dict, Tuple
+from typing import List, Annotated, Optional, Tuple
 from threading import RLock
 
 from pydantic import BaseModel, Field, field_validator
 
 from models.event import Event
-from utils.vesting_calculator import VestingCalculator, DefaultVestingCalculator
+from utils.event_index import EventIndex
+from utils.instrumentation import metrics
+from utils.vesting_calculator import VestingCalculator, IndexedVestingCalculator
+
+class _DateKeyedCache(dict):
+    latest: Optional[date] = None
+
+    def __setitem__(self, cache_key: Tuple[date, int], value: Decimal) -> None:
+        super().__setitem__(cache_key, value)
+        if self.latest is None or cache_key[0] > self.latest:
+            self.latest = cache_key[0]
+
+    def clear(self) -> None:
+        super().clear()
+        self.latest = None
+
+    def invalidate_from(self, from_date: date) -> None:
+        # Events mostly arrive in date order, so the common case never touches the keys.
+        if self.latest is None or from_date > self.latest:
+            return
+        stale_keys = [cache_key for cache_key in self if cache_key[0] >= from_date]
+        for cache_key in stale_keys:
+            del self[cache_key]
+        self.latest = max((cache_key[0] for cache_key in self), default=None)
 
-_award_lock = RLock()
 
 class Award(BaseModel):
     award_id: str
@@ -17,30 +39,37 @@ class Award(BaseModel):
     vested_events: Annotated[List[Event], Field(default_factory=list)]
     cancelled_events: Annotated[List[Event], Field(default_factory=list)]
     performance_events: Annotated[List[Event], Field(default_factory=list)]
-    _vesting_cache: Dict[Tuple[date, int], Decimal] = None
-    _cancellation_cache: Dict[Tuple[date, int], Decimal] = None
-    _performance_cache: Dict[Tuple[date, int], Decimal] = None
-    _net_vesting_cache: Dict[Tuple[date, int], Decimal] = None
-    _is_cache_valid: bool = True
+    _vesting_cache: _DateKeyedCache = None
+    _cancellation_cache: _DateKeyedCache = None
+    _performance_cache: _DateKeyedCache = None
+    _net_vesting_cache: _DateKeyedCache = None
+    _vested_index: EventIndex = None
+    _cancelled_index: EventIndex = None
+    _performance_index: EventIndex = None
     _calculation_lock: RLock = None
-    _calculator: VestingCalculator = DefaultVestingCalculator()
+    _calculator: VestingCalculator = IndexedVestingCalculator()
 
     def __init__(self, **data):
         super().__init__(**data)
-        self._calculation_lock = _award_lock
-        self._vesting_cache = {}
-        self._cancellation_cache = {}
-        self._performance_cache = {}
-        self._net_vesting_cache = {}
+        self._calculation_lock = RLock()
+        self._vesting_cache = _DateKeyedCache()
+        self._cancellation_cache = _DateKeyedCache()
+        self._performance_cache = _DateKeyedCache()
+        self._net_vesting_cache = _DateKeyedCache()
+        self._vested_index = EventIndex(self.vested_events)
+        self._cancelled_index = EventIndex(self.cancelled_events)
+        self._performance_index = EventIndex(self.performance_events)
 
     def __getstate__(self):
-        state = self.__dict__.copy()
-        state['_calculation_lock'] = None
+        state = super().__getstate__()
+        private = dict(state['__pydantic_private__'])
+        private['_calculation_lock'] = None
+        state['__pydantic_private__'] = private
         return state
 
     def __setstate__(self, state):
-        self.__dict__.update(state)
-        self._calculation_lock = _award_lock
+        super().__setstate__(state)
+        self._calculation_lock = RLock()
 
     @field_validator('award_id', 'employee_id', 'employee_name', mode="after")
     @classmethod
@@ -55,22 +84,46 @@ class Award(BaseModel):
 
     def add_vested_event(self, event: Event) -> None:
         with self._calculation_lock:
-            self.vested_events.append(event)
-            self._invalidate_cache()
+            self._vested_index.add(event)
+            self._invalidate_cache_from(self._vesting_cache, event.event_date)
 
     def add_cancelled_event(self, event: Event) -> None:
         with self._calculation_lock:
-            self.cancelled_events.append(event)
-            self._invalidate_cache()
+            self._cancelled_index.add(event)
+            self._invalidate_cache_from(self._cancellation_cache, event.event_date)
 
     def add_performance_event(self, event: Event) -> None:
         with self._calculation_lock:
-            self.performance_events.append(event)
+            self._performance_index.add(event)
+            self._invalidate_cache_from(self._performance_cache, event.event_date)
+
+    def restore_sorted_events(self, vested: Tuple[List[Event], List[Decimal]],
+                              cancelled: Tuple[List[Event], List[Decimal]],
+                              performance: Tuple[List[Event], List[Decimal]]) -> None:
+        with self._calculation_lock:
+            self._vested_index.extend_sorted(*vested)
+            self._cancelled_index.extend_sorted(*cancelled)
+            self._performance_index.extend_sorted(*performance)
             self._invalidate_cache()
 
+    def latest_event_date(self) -> Optional[date]:
+        with self._calculation_lock:
+            dates = [index.dates[-1] for index in (self._vested_index, self._cancelled_index, self._performance_index)
+                     if len(index)]
+            return max(dates) if dates else None
+
+    def running_totals(self) -> Tuple[Decimal, Decimal, Decimal]:
+        with self._calculation_lock:
+            return tuple(index.totals[-1] if len(index) else Decimal(0)
+                         for index in (self._vested_index, self._cancelled_index, self._performance_index))
+
+    def _invalidate_cache_from(self, cache: _DateKeyedCache, from_date: date) -> None:
+        with self._calculation_lock:
+            cache.invalidate_from(from_date)
+            self._net_vesting_cache.invalidate_from(from_date)
+
     def _invalidate_cache(self) -> None:
         with self._calculation_lock:
-            self._is_cache_valid = False
             if self._vesting_cache is not None:
                 self._vesting_cache.clear()
             if self._cancellation_cache is not None:
@@ -81,47 +134,63 @@ class Award(BaseModel):
                 self._net_vesting_cache.clear()
 
     def total_vested_shares(self, target_date: date, precision: int = 0) -> Decimal:
-        with self._calculation_lock:
+        with metrics.timed_lock(self._calculation_lock, "award"):
             cache_key = (target_date, precision)
 
-            if self._is_cache_valid and cache_key in self._vesting_cache:
+            if cache_key in self._vesting_cache:
+                if metrics.enabled:
+                    metrics.count("award.cache.hits")
                 return self._vesting_cache[cache_key]
+            if metrics.enabled:
+                metrics.count("award.cache.misses")
 
-            result = self._calculator.calculate_vested_shares( self.vested_events, target_date)
+            result = self._calculator.calculate_vested_shares(self._vested_index, target_date)
 
             self._vesting_cache[cache_key] = result
             return result
 
     def total_cancelled_shares(self, target_date: date, precision: int = 0) -> Decimal:
-        with self._calculation_lock:
+        with metrics.timed_lock(self._calculation_lock, "award"):
             cache_key = (target_date, precision)
 
-            if self._is_cache_valid and cache_key in self._cancellation_cache:
+            if cache_key in self._cancellation_cache:
+                if metrics.enabled:
+                    metrics.count("award.cache.hits")
                 return self._cancellation_cache[cache_key]
+            if metrics.enabled:
+                metrics.count("award.cache.misses")
 
-            result = self._calculator.calculate_cancelled_shares(self.cancelled_events, target_date)
+            result = self._calculator.calculate_cancelled_shares(self._cancelled_index, target_date)
 
             self._cancellation_cache[cache_key] = result
             return result
 
     def total_performance_events(self, target_date: date, precision: int = 0) -> Decimal:
-        with self._calculation_lock:
+        with metrics.timed_lock(self._calculation_lock, "award"):
             cache_key = (target_date, precision)
 
-            if self._is_cache_valid and cache_key in self._performance_cache:
+            if cache_key in self._performance_cache:
+                if metrics.enabled:
+                    metrics.count("award.cache.hits")
                 return self._performance_cache[cache_key]
+            if metrics.enabled:
+                metrics.count("award.cache.misses")
 
-            result = self._calculator.calculate_performance_bonus(self.performance_events, target_date)
+            result = self._calculator.calculate_performance_bonus(self._performance_index, target_date)
 
             self._performance_cache[cache_key] = result
             return result
 
     def net_vested_shares(self, target_date: date, precision: int = 0) -> Decimal:
-        with self._calculation_lock:
+        with metrics.timed_lock(self._calculation_lock, "award"):
             cache_key = (target_date, precision)
 
-            if self._is_cache_valid and cache_key in self._net_vesting_cache:
+            if cache_key in self._net_vesting_cache:
+                if metrics.enabled:
+                    metrics.count("award.cache.hits")
                 return self._net_vesting_cache[cache_key]
+            if metrics.enabled:
+                metrics.count("award.cache.misses")
 
             total_vested_shares = self.total_vested_shares(target_date, precision)
             total_cancelled_shares = self.total_cancelled_shares(target_date, precision)
@@ -132,3 +201,28 @@ class Award(BaseModel):
 
             self._net_vesting_cache[cache_key] = net_vested
             return net_vested
+
+    def remaining_vested_series(self, sorted_dates: List[date]) -> List[Decimal]:
+        with metrics.timed_lock(self._calculation_lock, "award"):
+            vested_totals = self._vested_index.totals_at(sorted_dates)
+            cancelled_totals = self._cancelled_index.totals_at(sorted_dates)
+            return [total_vested - total_cancelled
+                    for total_vested, total_cancelled in zip(vested_totals, cancelled_totals)]
+
+    def net_vested_shares_series(self, target_dates: List[date], precision: int = 0) -> List[Decimal]:
+        with metrics.timed_lock(self._calculation_lock, "award"):
+            if not isinstance(self._calculator, IndexedVestingCalculator):
+                return [self.net_vested_shares(target_date, precision) for target_date in target_dates]
+
+            sorted_dates = sorted(set(target_dates))
+            vested_totals = self._vested_index.totals_at(sorted_dates)
+            cancelled_totals = self._cancelled_index.totals_at(sorted_dates)
+            performance_totals = self._performance_index.totals_at(sorted_dates)
+
+            net_by_date = {}
+            for target_date, total_vested, total_cancelled, total_performance in zip(
+                    sorted_dates, vested_totals, cancelled_totals, performance_totals):
+                performance_bonus = total_performance if total_performance > 0 else Decimal(1)
+                cancelled = min(total_vested, total_cancelled)
+                net_by_date[target_date] = (total_vested - cancelled) * performance_bonus
+            return [net_by_date[target_date] for target_date in target_dates]
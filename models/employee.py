@@ -9,13 +9,26 @@ class Employee(BaseModel):
     employee_id: str
     name: str
     awards: Annotated[Dict[str, Award], Field(default_factory=dict)]
+    _award_order: List[str] = None
+    _award_order_dirty: bool = False
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        self._award_order = sorted(self.awards.keys())
 
     def add_award(self, award: Award) -> None:
+        if award.award_id not in self.awards:
+            self._award_order.append(award.award_id)
+            self._award_order_dirty = True
         self.awards[award.award_id] = award
 
-    def get_sorted_awards(self) -> List[Award]:
-        sorted_awards = []
-        for key, award in sorted(self.awards.items()):
-            sorted_awards.append(award)
+    def sorted_award_ids(self) -> List[str]:
+        if len(self._award_order) != len(self.awards):
+            self._award_order = sorted(self.awards.keys())
+        elif self._award_order_dirty:
+            self._award_order.sort()
+        self._award_order_dirty = False
+        return self._award_order
 
-        return sorted_awards
+    def get_sorted_awards(self) -> List[Award]:
+        return [self.awards[award_id] for award_id in self.sorted_award_ids()]
@@ -1,5 +1,6 @@
 from datetime import date
 from decimal import Decimal
+from typing import Union
 
 from pydantic import BaseModel, field_validator
 from enum import StrEnum
@@ -25,3 +26,58 @@ class Event(BaseModel):
         if value <= 0:
             raise ValueError("Quantity must be positive")
         return value
+
+
+class EventRecord:
+    __slots__ = ("event_type", "employee_id", "employee_name", "award_id", "event_date", "quantity")
+
+    def __init__(self, event_type: EventType, employee_id: str, employee_name: str,
+                 award_id: str, event_date: date, quantity: Decimal):
+        self.event_type = event_type
+        self.employee_id = employee_id
+        self.employee_name = employee_name
+        self.award_id = award_id
+        self.event_date = event_date
+        self.quantity = quantity
+
+    def __getstate__(self):
+        return self._as_tuple()
+
+    def __setstate__(self, state):
+        (self.event_type, self.employee_id, self.employee_name,
+         self.award_id, self.event_date, self.quantity) = state
+
+    def _as_tuple(self) -> tuple:
+        return (self.event_type, self.employee_id, self.employee_name,
+                self.award_id, self.event_date, self.quantity)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, EventRecord):
+            return NotImplemented
+        return self._as_tuple() == other._as_tuple()
+
+    def __hash__(self) -> int:
+        return hash(self._as_tuple())
+
+    def __repr__(self) -> str:
+        return (f"EventRecord(event_type={self.event_type!s}, employee_id={self.employee_id!r}, "
+                f"employee_name={self.employee_name!r}, award_id={self.award_id!r}, "
+                f"event_date={self.event_date!r}, quantity={self.quantity!r})")
+
+    @classmethod
+    def from_event(cls, event: Event) -> 'EventRecord':
+        return cls(event.event_type, event.employee_id, event.employee_name,
+                   event.award_id, event.event_date, event.quantity)
+
+    def to_event(self) -> Event:
+        return Event(
+            event_type=self.event_type,
+            employee_id=self.employee_id,
+            employee_name=self.employee_name,
+            award_id=self.award_id,
+            event_date=self.event_date,
+            quantity=self.quantity
+        )
+
+
+ParsedEvent = Union[Event, EventRecord]
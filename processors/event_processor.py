@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Type, Dict, TypeVar, Callable
+from decimal import Decimal
+from typing import Type, Dict, TypeVar, Callable, Iterable, List, Optional, Sequence
 from typing_extensions import ClassVar
 
 from exceptions.vesting_exception import VestingValidationError
 from models.award import Award
 from models.event import EventType, Event
+from utils.instrumentation import metrics
 
 T = TypeVar('T', bound='EventProcessor')
 
@@ -48,9 +50,10 @@ class VestEventProcessor(EventProcessor):
 @EventProcessor.register(EventType.CANCEL)
 class CancelEventProcessor(EventProcessor):
     def validate(self, event: Event, award: Award) -> None:
-        vested_to_date = award.total_vested_shares(event.event_date)
-        cancelled_to_date = award.total_cancelled_shares(event.event_date)
-        net_vested = vested_to_date - cancelled_to_date
+        with metrics.phase("cancel.validate"):
+            vested_to_date = award.total_vested_shares(event.event_date)
+            cancelled_to_date = award.total_cancelled_shares(event.event_date)
+            net_vested = vested_to_date - cancelled_to_date
 
         if event.quantity > net_vested or net_vested <= 0:
             raise VestingValidationError(f"Cannot cancel more shares than vested.")
@@ -76,3 +79,29 @@ class PerformanceBonusEventProcessor(EventProcessor):
 def create_event_processor(event_type: EventType) -> EventProcessor:
     processor_class = EventProcessor.get_processor(event_type)
     return processor_class()
+
+
+def cancel_balances(events: Sequence[Event], award: Award) -> List[Decimal]:
+    cancel_dates = [event.event_date for event in events if event.event_type == EventType.CANCEL]
+    if not cancel_dates:
+        return []
+    return award.remaining_vested_series(cancel_dates)
+
+
+def first_invalid_cancel(events: Sequence[Event], balances: Iterable[Decimal]) -> Optional[int]:
+    with metrics.phase("cancel.validate_batch"):
+        balances = iter(balances)
+        running = Decimal(0)
+        for position, event in enumerate(events):
+            if event.event_type == EventType.VEST:
+                running += event.quantity
+            elif event.event_type == EventType.CANCEL:
+                net_vested = next(balances) + running
+                if event.quantity > net_vested or net_vested <= 0:
+                    return position
+                running -= event.quantity
+        return None
+
+
+def find_invalid_cancel(events: Sequence[Event], award: Award) -> Optional[int]:
+    return first_invalid_cancel(events, cancel_balances(events, award))
@@ -0,0 +1,81 @@
+from collections import OrderedDict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.instrumentation import metrics
+
+ScheduleKey = Tuple[date, int]
+ScheduleRow = Tuple[str, str, str, Decimal]
+AwardKey = Tuple[str, str]
+
+
+class ScheduleEntry:
+    __slots__ = ("rows", "positions", "dirty")
+
+    def __init__(self, rows: List[ScheduleRow]):
+        self.rows = rows
+        self.positions: Dict[AwardKey, int] = {(row[0], row[2]): position for position, row in enumerate(rows)}
+        self.dirty: Set[AwardKey] = set()
+
+
+class ScheduleCache:
+    def __init__(self, maxsize: int = 256):
+        if maxsize <= 0:
+            raise ValueError(f"Schedule cache size must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self._entries: "OrderedDict[ScheduleKey, ScheduleEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: ScheduleKey) -> bool:
+        return key in self._entries
+
+    def get(self, key: ScheduleKey) -> Optional[ScheduleEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            if metrics.enabled:
+                metrics.count("schedule_cache.misses")
+            return None
+
+        self._entries.move_to_end(key)
+        if entry.dirty:
+            self.refreshes += 1
+            if metrics.enabled:
+                metrics.count("schedule_cache.refreshes")
+        else:
+            self.hits += 1
+            if metrics.enabled:
+                metrics.count("schedule_cache.hits")
+        return entry
+
+    def put(self, key: ScheduleKey, rows: List[ScheduleRow]) -> ScheduleEntry:
+        entry = ScheduleEntry(rows)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def invalidate_awards(self, changes: Dict[AwardKey, date]) -> None:
+        for (target_date, precision), entry in self._entries.items():
+            for award_key, from_date in changes.items():
+                if target_date >= from_date:
+                    entry.dirty.add(award_key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+        }
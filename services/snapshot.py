@@ -0,0 +1,230 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Tuple, Union
+
+from exceptions.snapshot_exception import SnapshotError
+from models.award import Award
+from models.employee import Employee
+from models.event import EventRecord, EventType
+from services.vesting_service import VestingService
+
+SNAPSHOT_MAGIC = b"VSNP"
+SNAPSHOT_VERSION = 2
+EVENT_KINDS = (EventType.VEST, EventType.CANCEL, EventType.PERFORMANCE)
+AWARD_FIELDS = 6
+
+# magic, version, string count, award count, event count, dedup group count, dedup key count
+_HEADER = struct.Struct("<4sI5Q")
+_ALIGNMENT = 8
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+Column = Union[memoryview, array]
+
+
+def _split_decimal(value: Decimal) -> Tuple[int, int]:
+    sign, digits, exponent = value.as_tuple()
+    if not isinstance(exponent, int):
+        raise SnapshotError(f"Cannot store non-finite quantity: {value}")
+    coefficient = int("".join(map(str, digits)) or "0")
+    if sign:
+        coefficient = -coefficient
+    if not (_INT64_MIN <= coefficient <= _INT64_MAX and -128 <= exponent <= 127):
+        raise SnapshotError(f"Quantity does not fit the snapshot format: {value}")
+    return coefficient, exponent
+
+
+def _join_decimal(coefficient: int, exponent: int) -> Decimal:
+    return Decimal(coefficient).scaleb(exponent)
+
+
+def _padding(length: int) -> bytes:
+    return b"\0" * (-length % _ALIGNMENT)
+
+
+class _StringTable:
+    def __init__(self):
+        self.strings: List[str] = []
+        self._positions: Dict[str, int] = {}
+
+    def index(self, value: str) -> int:
+        position = self._positions.get(value)
+        if position is None:
+            position = len(self.strings)
+            self._positions[value] = position
+            self.strings.append(value)
+        return position
+
+
+def _as_little_endian(column: array) -> array:
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column
+
+
+def save_snapshot(service: VestingService, file_path: str) -> None:
+    strings = _StringTable()
+    awards = array("I")
+    quantity_coefficients, quantity_exponents = array("q"), array("b")
+    total_coefficients, total_exponents = array("q"), array("b")
+    ordinals = array("i")
+
+    for employee_id, employee in service.employees.items():
+        for award_id, award in employee.awards.items():
+            indices = (award._vested_index, award._cancelled_index, award._performance_index)
+            awards.extend((
+                strings.index(employee_id), strings.index(employee.name), strings.index(award_id),
+                *(len(index) for index in indices)
+            ))
+            for index in indices:
+                for event, total in zip(index, index.totals):
+                    coefficient, exponent = _split_decimal(event.quantity)
+                    quantity_coefficients.append(coefficient)
+                    quantity_exponents.append(exponent)
+                    coefficient, exponent = _split_decimal(total)
+                    total_coefficients.append(coefficient)
+                    total_exponents.append(exponent)
+                    ordinals.append(event.event_date.toordinal())
+
+    key_groups, dedup_keys = array("I"), array("Q")
+    for (employee_id, award_id), award_keys in service._processed_events.keys.items():
+        key_groups.extend((strings.index(employee_id), strings.index(award_id), len(award_keys)))
+        dedup_keys.extend(award_keys)
+
+    encoded = [value.encode("utf-8") for value in strings.strings]
+    string_offsets = array("Q", [0])
+    for value in encoded:
+        string_offsets.append(string_offsets[-1] + len(value))
+
+    sections = [
+        string_offsets, b"".join(encoded), awards,
+        quantity_coefficients, total_coefficients, ordinals, quantity_exponents, total_exponents,
+        key_groups, dedup_keys,
+    ]
+
+    temporary_path = f"{file_path}.tmp"
+    with open(temporary_path, "wb") as snapshot_file:
+        header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(encoded),
+                              len(awards) // AWARD_FIELDS, len(ordinals), len(key_groups) // 3, len(dedup_keys))
+        snapshot_file.write(header + _padding(len(header)))
+        for section in sections:
+            data = section if isinstance(section, bytes) else _as_little_endian(section).tobytes()
+            snapshot_file.write(data + _padding(len(data)))
+    os.replace(temporary_path, file_path)
+
+
+class _SnapshotReader:
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._offset = 0
+        self._columns: List[memoryview] = []
+
+    def take(self, length: int) -> memoryview:
+        end = self._offset + length
+        if end > len(self._view):
+            raise SnapshotError("Snapshot file is truncated")
+        section = self._view[self._offset:end]
+        self._offset = end + (-length % _ALIGNMENT)
+        self._columns.append(section)
+        return section
+
+    def column(self, typecode: str, count: int) -> Column:
+        section = self.take(count * array(typecode).itemsize)
+        if sys.byteorder == "big":
+            column = array(typecode, section.tobytes())
+            column.byteswap()
+            return column
+        column = section.cast(typecode)
+        self._columns.append(column)
+        return column
+
+    def release(self) -> None:
+        for column in reversed(self._columns):
+            column.release()
+        self._columns.clear()
+
+
+def load_snapshot(file_path: str, **service_options) -> VestingService:
+    if not os.path.exists(file_path):
+        raise SnapshotError(f"Snapshot not found: {file_path}")
+
+    with open(file_path, "rb") as snapshot_file:
+        if os.fstat(snapshot_file.fileno()).st_size < _HEADER.size:
+            raise SnapshotError(f"Not a vesting snapshot: {file_path}")
+        with mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ) as snapshot_map:
+            view = memoryview(snapshot_map)
+            reader = _SnapshotReader(view)
+            try:
+                return _read_service(reader, file_path, service_options)
+            finally:
+                reader.release()
+                view.release()
+
+
+def _read_service(reader: _SnapshotReader, file_path: str, service_options: Dict) -> VestingService:
+    magic, version, string_count, award_count, event_count, group_count, key_count = _HEADER.unpack(
+        reader.take(_HEADER.size)
+    )
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError(f"Not a vesting snapshot: {file_path}")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version}, expected {SNAPSHOT_VERSION}")
+
+    string_offsets = reader.column("Q", string_count + 1)
+    string_blob = reader.take(string_offsets[-1])
+    strings = [
+        sys.intern(str(string_blob[string_offsets[position]:string_offsets[position + 1]], "utf-8"))
+        for position in range(string_count)
+    ]
+
+    awards = reader.column("I", award_count * AWARD_FIELDS)
+    quantity_coefficients = reader.column("q", event_count)
+    total_coefficients = reader.column("q", event_count)
+    ordinals = reader.column("i", event_count)
+    quantity_exponents = reader.column("b", event_count)
+    total_exponents = reader.column("b", event_count)
+
+    service = VestingService(**service_options)
+    position = 0
+    for award_number in range(award_count):
+        employee_index, name_index, award_index, *counts = \
+            awards[award_number * AWARD_FIELDS:(award_number + 1) * AWARD_FIELDS]
+        employee_id, employee_name, award_id = strings[employee_index], strings[name_index], strings[award_index]
+
+        employee = service.employees.get(employee_id)
+        if employee is None:
+            employee = Employee(employee_id=employee_id, name=employee_name, awards={})
+            service.register_employee(employee)
+
+        restored = []
+        for event_type, count in zip(EVENT_KINDS, counts):
+            events, totals = [], []
+            for event_position in range(position, position + count):
+                events.append(EventRecord(
+                    event_type, employee_id, employee_name, award_id,
+                    date.fromordinal(ordinals[event_position]),
+                    _join_decimal(quantity_coefficients[event_position], quantity_exponents[event_position])
+                ))
+                totals.append(_join_decimal(total_coefficients[event_position], total_exponents[event_position]))
+            restored.append((events, totals))
+            position += count
+
+        award = Award(award_id=award_id, employee_id=employee_id, employee_name=employee_name)
+        award.restore_sorted_events(*restored)
+        service.register_award(employee, award)
+
+    key_groups = reader.column("I", group_count * 3)
+    dedup_keys = reader.column("Q", key_count)
+    position = 0
+    for group in range(group_count):
+        employee_index, award_index, count = key_groups[group * 3:(group + 1) * 3]
+        award_key = (strings[employee_index], strings[award_index])
+        for key in dedup_keys[position:position + count]:
+            service._processed_events.add_key(award_key, key)
+        position += count
+    return service
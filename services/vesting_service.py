@@ -1,68 +1,186 @@
 from collections import defaultdict
 from datetime import date
+from itertools import repeat
 from decimal import Decimal
-from typing import Dict, List, Tuple, DefaultDict, Set, Optional
+from typing import Dict, List, Tuple, Optional, Iterable
 from threading import RLock
 
 from exceptions.vesting_exception import VestingValidationError
 from models.award import Award
 from models.employee import Employee
-from models.event import Event
+from models.event import Event, EventType
 from utils.decimal_utils import format_decimal
-from processors.event_processor import create_event_processor
+from processors.event_processor import create_event_processor, find_invalid_cancel, first_invalid_cancel
+from utils.columnar_store import ColumnarEventStore
 from utils.concurrency_utils import parallel_map
+from utils.dedup import EventDeduplicator, event_key
+from utils.instrumentation import metrics
+from utils.vesting_calculator import DEFAULT_ENGINE, create_calculator
+from services.schedule_cache import ScheduleCache
+
+AwardKey = Tuple[str, str]
+AwardColumns = Tuple[AwardKey, Tuple[List[int], ...], Tuple[List[Decimal], ...], Optional[int]]
+EVENT_KINDS = (EventType.VEST, EventType.CANCEL, EventType.PERFORMANCE)
+
+
+def apply_event(event: Event, award: Award) -> None:
+    processor = create_event_processor(event.event_type)
+
+    try:
+        processor.validate(event, award)
+        processor.process(event, award)
+    except VestingValidationError as e:
+        raise VestingValidationError(
+            f"Validation error processing {event.event_type} event for "
+            f"employee {event.employee_id}, award {event.award_id}: {str(e)}"
+        )
+
+
+def process_award_group(award_group: Tuple[AwardKey, Award, List[Event]]) -> Tuple[AwardKey, Award]:
+    award_key, award, events = award_group
+    sorted_events = sorted(events, key=lambda e: e.event_date)
+    invalid_position = find_invalid_cancel(sorted_events, award)
+
+    for position, event in enumerate(sorted_events):
+        try:
+            if event.event_type == EventType.CANCEL and (invalid_position is None or position < invalid_position):
+                award.add_cancelled_event(event)
+            else:
+                apply_event(event, award)
+        except Exception as error:
+            raise VestingValidationError(f"Award event can't be processed: {error} ")
+    return award_key, award
+
+
+def build_award_group(award_group: Tuple[AwardKey, List[Event], Tuple[Decimal, Decimal, Decimal]]) -> AwardColumns:
+    award_key, events, base_totals = award_group
+    order = sorted(range(len(events)), key=lambda position: events[position].event_date)
+    sorted_events = [events[position] for position in order]
+    # Every new event is on or after the award's history, so each cancel sees the same base balance.
+    invalid_position = first_invalid_cancel(sorted_events, repeat(base_totals[0] - base_totals[1]))
+
+    positions: Tuple[List[int], ...] = ([], [], [])
+    totals: Tuple[List[Decimal], ...] = ([], [], [])
+    running = list(base_totals)
+    for sorted_position, position in enumerate(order):
+        event = events[position]
+        kind = EVENT_KINDS.index(event.event_type)
+        if sorted_position == invalid_position or (event.event_type != EventType.CANCEL and event.quantity <= 0):
+            return award_key, positions, totals, position
+        running[kind] += event.quantity
+        positions[kind].append(position)
+        totals[kind].append(running[kind])
+    return award_key, positions, totals, None
+
+
+def render_schedules(employees: List[Employee], target_dates: List[date],
+                     precision: int = 0) -> List[List[Tuple[str, str, str, Decimal]]]:
+    results = [[] for _ in target_dates]
+    for employee in employees:
+        for award in employee.get_sorted_awards():
+            if len(target_dates) == 1:
+                series = [award.net_vested_shares(target_dates[0], precision)]
+            else:
+                series = award.net_vested_shares_series(target_dates, precision)
+
+            for rows, net_vested in zip(results, series):
+                rows.append((employee.employee_id, employee.name, award.award_id,
+                             format_decimal(net_vested, precision)))
+    return results
 
-_service_lock = RLock()
 
 class VestingService:
-    def __init__(self, use_parallel: bool = True, max_workers: int = None):
+    def __init__(self, use_parallel: bool = True, max_workers: int = None, executor: str = "thread",
+                 schedule_cache_size: int = 256, engine: str = DEFAULT_ENGINE):
         self.employees: Dict[str, Employee] = {}
-        self._lock: Optional[RLock] = _service_lock
-        self._schedule_cache: DefaultDict[Tuple[date, int], List] = defaultdict(list)
-        self._cache_valid: bool = True
-        self._processed_events: Set[Tuple] = set()
+        self._lock: Optional[RLock] = RLock()
+        self._schedule_cache = ScheduleCache(schedule_cache_size)
+        self._award_count = 0
+        self._processed_events = EventDeduplicator()
+        self._award_index: Dict[str, Dict[str, Award]] = {}
+        self._employee_order: List[str] = []
+        self._employee_order_dirty = False
         self.use_parallel = use_parallel
         self.max_workers = max_workers
+        self.executor = executor
+        self.engine = engine
+        self.calculator = create_calculator(engine)
+        self._columnar_store: Optional[ColumnarEventStore] = None
 
     def __getstate__(self):
         state = self.__dict__.copy()
         state['_lock'] = None
+        state['_columnar_store'] = None
         return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
-        self._lock = _service_lock
+        self._lock = RLock()
+
+    def _invalidate_cache(self, changes: Dict[AwardKey, date], awards_added: bool) -> None:
+        with self._lock:
+            if awards_added or changes:
+                self._columnar_store = None
+            if awards_added:
+                self._schedule_cache.clear()
+            elif changes:
+                self._schedule_cache.invalidate_awards(changes)
 
-    def _invalidate_cache(self):
-        self._cache_valid = False
-        self._schedule_cache.clear()
+    def cache_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return self._schedule_cache.stats()
 
-    def _create_event_key(self, event: Event) -> Tuple:
-        return (event.event_type, event.employee_id, event.award_id,
-                event.event_date, float(event.quantity))
+    def release_processed_events(self, employee_id: str, award_id: str) -> None:
+        self._processed_events.release((employee_id, award_id))
 
     def _ensure_employee_and_award(self, event: Event) -> Award:
-        with self._lock:
+        with metrics.timed_lock(self._lock, "service"):
             if event.employee_id not in self.employees:
-                self.employees[event.employee_id] = Employee(
+                self.register_employee(Employee(
                     employee_id=event.employee_id,
                     name=event.employee_name,
                     awards={}
-                )
+                ))
 
             employee = self.employees[event.employee_id]
 
             if event.award_id not in employee.awards:
-                employee.awards[event.award_id] = Award(
+                self.register_award(employee, Award(
                     award_id=event.award_id,
                     employee_id=event.employee_id,
                     employee_name=event.employee_name,
                     vested_events=[],
                     cancelled_events=[],
                     performance_events=[]
-                )
+                ))
             return employee.awards[event.award_id]
 
+    def register_employee(self, employee: Employee) -> None:
+        with self._lock:
+            if employee.employee_id not in self.employees:
+                self._employee_order.append(employee.employee_id)
+                self._employee_order_dirty = True
+            self.employees[employee.employee_id] = employee
+
+    def sorted_employee_ids(self) -> List[str]:
+        with self._lock:
+            if len(self._employee_order) != len(self.employees):
+                self._employee_order = sorted(self.employees.keys())
+            elif self._employee_order_dirty:
+                self._employee_order.sort()
+            self._employee_order_dirty = False
+            return self._employee_order
+
+    def register_award(self, employee: Employee, award: Award) -> None:
+        with self._lock:
+            if award.award_id not in employee.awards:
+                self._award_count += 1
+            if award._calculator is not self.calculator:
+                award.set_calculator(self.calculator)
+            employee.add_award(award)
+            self._award_index.setdefault(award.award_id, {})[employee.employee_id] = award
+            self._columnar_store = None
+
     def _initialize_employees_and_awards(self, events: List[Event]) -> None:
         unique_combinations = set()
 
@@ -72,88 +190,220 @@ class VestingService:
                 unique_combinations.add((event.employee_id, event.award_id))
 
     def _process_event(self, event: Event) -> None:
-            award = self._ensure_employee_and_award(event)
-            processor = create_event_processor(event.event_type)
+        award = self._ensure_employee_and_award(event)
+        apply_event(event, award)
 
-            try:
-                processor.validate(event, award)
-                processor.process(event, award)
-            except VestingValidationError as e:
-                raise VestingValidationError(
-                    f"Validation error processing {event.event_type} event for "
-                    f"employee {event.employee_id}, award {event.award_id}: {str(e)}"
-                )
-
-    def _process_award_events(self, events_group: Tuple[str, List[Event]]):
+    def _process_award_events(self, events_group: Tuple[AwardKey, List[Event]]) -> AwardKey:
         award_key, events = events_group
+        if not events:
+            return award_key
 
-        for event in sorted(events, key=lambda e: e.event_date):
-            try:
-                self._process_event(event)
-            except Exception as error:
-                raise VestingValidationError(f"Award event can't be processed: {error} ")
+        award = self._ensure_employee_and_award(events[0])
+        process_award_group((award_key, award, events))
         return award_key
 
-    def process_events(self, events: List[Event]) -> None:
+    def _process_award_groups(self, award_events: Dict[AwardKey, List[Event]]) -> None:
+        if self.executor == "process":
+            award_groups = []
+            for award_key, events in award_events.items():
+                award = self.employees[award_key[0]].awards[award_key[1]]
+                latest_date = award.latest_event_date()
+                if latest_date is not None and events[0].event_date < latest_date:
+                    # Events that land inside the existing history cannot be appended, so apply them here.
+                    process_award_group((award_key, award, events))
+                else:
+                    award_groups.append((award_key, events, award.running_totals()))
+
+            results = parallel_map(
+                build_award_group,
+                award_groups,
+                max_workers=self.max_workers,
+                executor=self.executor
+            )
+            for (award_key, events, _), (_, positions, totals, rejected) in zip(award_groups, results):
+                award = self.employees[award_key[0]].awards[award_key[1]]
+                award.restore_sorted_events(*(
+                    ([events[position] for position in kind_positions], kind_totals)
+                    for kind_positions, kind_totals in zip(positions, totals)
+                ))
+                if rejected is not None:
+                    try:
+                        apply_event(events[rejected], award)
+                    except Exception as error:
+                        raise VestingValidationError(f"Award event can't be processed: {error} ")
+        else:
+            parallel_map(
+                self._process_award_events,
+                list(award_events.items()),
+                max_workers=self.max_workers,
+                executor=self.executor
+            )
+
+    def process_events(self, events: List[Event], presorted: bool = False) -> None:
         if not events:
             return
 
-        self._invalidate_cache()
-        sorted_events = sorted(events, key=lambda e: e.event_date)
+        with metrics.phase("service.process_events"):
+            self._process_sorted_events(events, presorted)
+
+    def _process_sorted_events(self, events: List[Event], presorted: bool) -> None:
+
+        sorted_events = events if presorted else sorted(events, key=lambda e: e.event_date)
+        award_count = self._award_count
+        changes: Dict[AwardKey, date] = {}
+        deduped = 0
 
-        if self.use_parallel:
-            self._initialize_employees_and_awards(sorted_events)
+        try:
+            if self.use_parallel:
+                self._initialize_employees_and_awards(sorted_events)
 
-            award_events = defaultdict(list)
-            for event in sorted_events:
-                event_key = self._create_event_key(event)
-                if event_key in self._processed_events:
-                    continue
+                award_events = defaultdict(list)
+                for event in sorted_events:
+                    key = (event.employee_id, event.award_id)
+                    processed_key = event_key(event)
+                    if self._processed_events.contains_key(key, processed_key):
+                        deduped += 1
+                        continue
 
-                key = (event.employee_id, event.award_id)
-                award_events[key].append(event)
-                self._processed_events.add(event_key)
+                    award_events[key].append(event)
+                    self._processed_events.add_key(key, processed_key)
+                    changes.setdefault(key, event.event_date)
 
-            if self.max_workers is not None and self.max_workers <= 0:
-                self.max_workers = None
+                if self.max_workers is not None and self.max_workers <= 0:
+                    self.max_workers = None
+
+                try:
+                    self._process_award_groups(award_events)
+                except Exception as error:
+                    raise VestingValidationError(error)
+            else:
+                for event in sorted_events:
+                    key = (event.employee_id, event.award_id)
+                    processed_key = event_key(event)
+                    if self._processed_events.contains_key(key, processed_key):
+                        deduped += 1
+                        continue
+
+                    if key not in changes or event.event_date < changes[key]:
+                        changes[key] = event.event_date
+                    self._process_event(event)
+                    self._processed_events.add_key(key, processed_key)
+        finally:
+            self._invalidate_cache(changes, self._award_count != award_count)
+            if metrics.enabled:
+                metrics.count("events.received", len(events))
+                metrics.count("events.deduped", deduped)
+
+    def process_event_stream(self, events: Iterable[Event], batch_size: int = 5000,
+                             presorted: bool = False) -> None:
+        if not presorted:
+            # Unsorted input has to be held whole; sort it in place rather than keeping a second copy.
+            events = list(events)
+            events.sort(key=lambda e: e.event_date)
+            self.process_events(events, presorted=True)
+            return
 
-            try:
-                parallel_map(
-                    self._process_award_events,
-                    list(award_events.items()),
-                    max_workers=self.max_workers
+        batch = []
+        last_date = None
+        for event in events:
+            if last_date is not None and event.event_date < last_date:
+                raise VestingValidationError(
+                    f"Input is not sorted by date: {event.event_date} follows {last_date}"
                 )
-            except Exception as error:
-                raise VestingValidationError(error)
-        else:
-            for event in sorted_events:
-                event_key = self._create_event_key(event)
+            last_date = event.event_date
+            batch.append(event)
 
-                if event_key in self._processed_events:
-                    continue
+            if len(batch) >= batch_size:
+                self.process_events(batch, presorted=True)
+                batch = []
 
-                self._process_event(event)
-                self._processed_events.add(event_key)
+        if batch:
+            self.process_events(batch, presorted=True)
 
-    def get_vesting_schedule(self, target_date: date, precision: int = 0) -> List[Tuple[str, str, str, Decimal]]:
+    def _schedule_row(self, employee: Employee, award: Award, target_date: date,
+                      precision: int) -> Tuple[str, str, str, Decimal]:
+        net_vested = format_decimal(award.net_vested_shares(target_date, precision), precision)
+        return employee.employee_id, employee.name, award.award_id, net_vested
+
+    def _render(self, target_dates: List[date], precision: int) -> List[List[Tuple[str, str, str, Decimal]]]:
+        with metrics.phase("service.render_schedules"):
+            if self.engine == "columnar":
+                return self._render_columnar(target_dates, precision)
+            employees = [self.employees[employee_id] for employee_id in self.sorted_employee_ids()]
+            return render_schedules(employees, target_dates, precision)
+
+    def _render_columnar(self, target_dates: List[date],
+                         precision: int) -> List[List[Tuple[str, str, str, Decimal]]]:
         with self._lock:
-            cache_key = (target_date, precision)
+            if self._columnar_store is None:
+                self._columnar_store = ColumnarEventStore.from_service(self)
+            store = self._columnar_store
+        return [store.get_vesting_schedule(target_date, precision) for target_date in target_dates]
 
-            if self._cache_valid and cache_key in self._schedule_cache:
-                return self._schedule_cache[cache_key]
+    def _cached_schedule(self, target_date: date, precision: int) -> Optional[List[Tuple[str, str, str, Decimal]]]:
+        cache_key = (target_date, precision)
+        with metrics.timed_lock(self._lock, "service"):
+            entry = self._schedule_cache.get(cache_key)
+            if entry is None or not entry.dirty:
+                return entry.rows if entry is not None else None
 
-        result = []
-        for employee_id in sorted(self.employees.keys()):
-            employee = self.employees[employee_id]
+            rows = list(entry.rows)
+            for employee_id, award_id in entry.dirty:
+                employee = self.employees[employee_id]
+                rows[entry.positions[(employee_id, award_id)]] = self._schedule_row(
+                    employee, employee.awards[award_id], target_date, precision
+                )
+            self._schedule_cache.put(cache_key, rows)
+            return rows
+
+    def get_vesting_schedule(self, target_date: date, precision: int = 0) -> List[Tuple[str, str, str, Decimal]]:
+        cached = self._cached_schedule(target_date, precision)
+        if cached is not None:
+            return cached
+
+        result = self._render([target_date], precision)[0]
+
+        with self._lock:
+            self._schedule_cache.put((target_date, precision), result)
+        return result
 
-            for award_id in sorted(employee.awards.keys()):
-                award = employee.awards[award_id]
-                net_vested = award.net_vested_shares(target_date, precision)
-                net_vested = format_decimal(net_vested, precision)
+    def get_vesting_schedules(self, target_dates: List[date],
+                              precision: int = 0) -> Dict[date, List[Tuple[str, str, str, Decimal]]]:
+        sorted_dates = sorted(set(target_dates))
+        if not sorted_dates:
+            return {}
 
-                result.append((employee_id, employee.name, award_id, net_vested))
+        results = {target_date: self._cached_schedule(target_date, precision) for target_date in sorted_dates}
+        missing_dates = [target_date for target_date, schedule in results.items() if schedule is None]
+        if not missing_dates:
+            return results
 
+        rendered = dict(zip(missing_dates, self._render(missing_dates, precision)))
         with self._lock:
-            self._schedule_cache[cache_key] = result
-            self._cache_valid = True
+            for target_date, schedule in rendered.items():
+                self._schedule_cache.put((target_date, precision), schedule)
+        results.update(rendered)
+        return results
+
+    def get_employee_schedule(self, employee_id: str, target_date: date,
+                              precision: int = 0) -> List[Tuple[str, str, str, Decimal]]:
+        employee = self.employees.get(employee_id)
+        if employee is None:
+            return []
+
+        result = []
+        for award in employee.get_sorted_awards():
+            net_vested = format_decimal(award.net_vested_shares(target_date, precision), precision)
+            result.append((employee_id, employee.name, award.award_id, net_vested))
+        return result
+
+    def get_award_vesting(self, award_id: str, target_date: date,
+                          precision: int = 0) -> List[Tuple[str, str, str, Decimal]]:
+        awards = self._award_index.get(award_id, {})
+
+        result = []
+        for employee_id in sorted(awards.keys()):
+            award = awards[employee_id]
+            net_vested = format_decimal(award.net_vested_shares(target_date, precision), precision)
+            result.append((employee_id, self.employees[employee_id].name, award_id, net_vested))
         return result
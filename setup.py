@@ -7,6 +7,9 @@ setup(
     install_requires=[
         "pydantic",
     ],
+    extras_require={
+        "columnar": ["numpy"],
+    },
     entry_points={
         "console_scripts": [
             "vesting_schedule=vesting_schedule.main:main",
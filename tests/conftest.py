@@ -0,0 +1,15 @@
+from datetime import date
+from decimal import Decimal
+
+from models.event import Event, EventType
+
+
+def make_event(event_type: EventType, employee_id: str, award_id: str, event_date: date, quantity: str) -> Event:
+    return Event(
+        event_type=event_type,
+        employee_id=employee_id,
+        employee_name=f"Employee {employee_id}",
+        award_id=award_id,
+        event_date=event_date,
+        quantity=Decimal(quantity)
+    )
@@ -290,3 +290,104 @@ class TestAwardModel:
         award.add_cancelled_event(cancel_event)
 
         assert award.net_vested_shares(date(2020, 3, 1)) == Decimal("0")
+
+    def test_out_of_order_events_are_kept_sorted(self):
+        award = Award(
+            award_id="ISO-001",
+            employee_id="E001",
+            employee_name="Alice Smith",
+            cancelled_events=[],
+            vested_events=[]
+        )
+
+        for event_date, quantity in [(date(2020, 3, 1), "300"), (date(2020, 1, 1), "100"), (date(2020, 2, 1), "200")]:
+            award.add_vested_event(Event(
+                event_type=EventType.VEST,
+                employee_id="E001",
+                employee_name="Alice Smith",
+                award_id="ISO-001",
+                event_date=event_date,
+                quantity=Decimal(quantity)
+            ))
+
+        assert [event.event_date for event in award.vested_events] == [
+            date(2020, 1, 1), date(2020, 2, 1), date(2020, 3, 1)
+        ]
+        assert award.total_vested_shares(date(2020, 1, 31)) == Decimal("100")
+        assert award.total_vested_shares(date(2020, 2, 1)) == Decimal("300")
+        assert award.total_vested_shares(date(2020, 3, 1)) == Decimal("600")
+
+    def test_append_only_invalidates_later_cached_dates(self):
+        award = Award(
+            award_id="ISO-001",
+            employee_id="E001",
+            employee_name="Alice Smith",
+            cancelled_events=[],
+            vested_events=[]
+        )
+
+        award.add_vested_event(Event(
+            event_type=EventType.VEST,
+            employee_id="E001",
+            employee_name="Alice Smith",
+            award_id="ISO-001",
+            event_date=date(2020, 1, 1),
+            quantity=Decimal("1000")
+        ))
+
+        assert award.net_vested_shares(date(2020, 1, 15)) == Decimal("1000")
+        assert award.net_vested_shares(date(2020, 3, 15)) == Decimal("1000")
+
+        award.add_cancelled_event(Event(
+            event_type=EventType.CANCEL,
+            employee_id="E001",
+            employee_name="Alice Smith",
+            award_id="ISO-001",
+            event_date=date(2020, 2, 1),
+            quantity=Decimal("400")
+        ))
+
+        assert (date(2020, 1, 15), 0) in award._net_vesting_cache
+        assert (date(2020, 1, 15), 0) in award._vesting_cache
+        assert (date(2020, 3, 15), 0) not in award._net_vesting_cache
+        assert (date(2020, 3, 15), 0) in award._vesting_cache
+        assert award.net_vested_shares(date(2020, 1, 15)) == Decimal("1000")
+        assert award.net_vested_shares(date(2020, 3, 15)) == Decimal("600")
+
+    def test_cache_tracks_latest_cached_date(self):
+        award = Award(award_id="ISO-001", employee_id="E001", employee_name="Alice Smith")
+        award.add_vested_event(Event(
+            event_type=EventType.VEST,
+            employee_id="E001",
+            employee_name="Alice Smith",
+            award_id="ISO-001",
+            event_date=date(2020, 1, 1),
+            quantity=Decimal("1000")
+        ))
+        award.net_vested_shares(date(2020, 1, 15))
+        award.net_vested_shares(date(2020, 3, 15))
+
+        assert award._net_vesting_cache.latest == date(2020, 3, 15)
+
+        award.add_vested_event(Event(
+            event_type=EventType.VEST,
+            employee_id="E001",
+            employee_name="Alice Smith",
+            award_id="ISO-001",
+            event_date=date(2020, 2, 1),
+            quantity=Decimal("500")
+        ))
+
+        assert award._net_vesting_cache.latest == date(2020, 1, 15)
+        assert award._vesting_cache.latest == date(2020, 1, 15)
+
+        award._vesting_cache.clear()
+
+        assert award._vesting_cache.latest is None
+        assert award.net_vested_shares(date(2020, 3, 15)) == Decimal("1500")
+
+    def test_awards_do_not_share_a_lock(self):
+        award_one = Award(award_id="ISO-001", employee_id="E001", employee_name="Alice Smith")
+        award_two = Award(award_id="ISO-002", employee_id="E001", employee_name="Alice Smith")
+
+        assert award_one._calculation_lock is not award_two._calculation_lock
@@ -0,0 +1,151 @@
+import io
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from benchmarks.generator import generate_rows, write_csv
+from models.event import EventType
+from services.vesting_service import VestingService
+from utils.csv_parser import parse_csv
+from utils.date_utils import date_range
+from utils.event_index import EventIndex
+from utils.vesting_calculator import CALCULATORS, DEFAULT_ENGINE, create_calculator
+from vesting_schedule.main import ENGINES
+
+VESTING_ONLY = """VEST,E001,Alice Smith,ISO-001,2020-01-01,1000
+VEST,E001,Alice Smith,ISO-001,2021-01-01,1000
+VEST,E001,Alice Smith,ISO-002,2020-03-01,300
+VEST,E001,Alice Smith,ISO-002,2020-04-01,500
+VEST,E002,Bobby Jones,NSO-001,2020-01-02,100
+VEST,E002,Bobby Jones,NSO-001,2020-02-02,200
+VEST,E002,Bobby Jones,NSO-001,2020-03-02,300
+VEST,E003,Cat Helms,NSO-002,2024-01-01,100
+"""
+
+WITH_CANCELLATIONS = """VEST,E001,Alice Smith,ISO-001,2020-01-01,1000
+VEST,E001,Alice Smith,ISO-001,2021-01-01,1000
+VEST,E001,Alice Smith,ISO-002,2020-03-01,500
+CANCEL,E001,Alice Smith,ISO-002,2020-04-01,200
+VEST,E002,Bobby Jones,NSO-001,2020-01-02,400
+CANCEL,E002,Bobby Jones,NSO-001,2020-02-02,200
+VEST,E002,Bobby Jones,NSO-001,2020-03-02,300
+VEST,E003,Cat Helms,NSO-002,2023-01-01,500
+VEST,E003,Cat Helms,NSO-002,2024-01-01,500
+CANCEL,E003,Cat Helms,NSO-002,2024-02-01,300
+"""
+
+WITH_PERFORMANCE = """VEST,E001,Alice Smith,ISO-001,2020-01-01,1000
+PERFORMANCE,E001,Alice Smith,ISO-001,2020-12-31,2
+"""
+
+FRACTIONAL = """VEST,E001,Alice Smith,ISO-001,2020-01-01,100.125
+VEST,E001,Alice Smith,ISO-001,2020-02-01,2.4375
+CANCEL,E001,Alice Smith,ISO-001,2020-03-01,50.5
+PERFORMANCE,E001,Alice Smith,ISO-001,2020-04-01,1.5
+VEST,E002,Bobby Jones,NSO-001,2020-01-15,33.333
+"""
+
+FIXTURES = {
+    "vesting_only": (VESTING_ONLY, date(2020, 4, 1), {
+        ("E001", "ISO-001"): Decimal("1000"), ("E001", "ISO-002"): Decimal("800"),
+        ("E002", "NSO-001"): Decimal("600"), ("E003", "NSO-002"): Decimal("0"),
+    }),
+    "with_cancellations": (WITH_CANCELLATIONS, date(2021, 1, 1), {
+        ("E001", "ISO-001"): Decimal("2000"), ("E001", "ISO-002"): Decimal("300"),
+        ("E002", "NSO-001"): Decimal("500"), ("E003", "NSO-002"): Decimal("0"),
+    }),
+    "with_performance": (WITH_PERFORMANCE, date(2021, 1, 1), {
+        ("E001", "ISO-001"): Decimal("2000"),
+    }),
+}
+
+
+def load_events(tmp_path, content: str, precision: int):
+    csv_path = tmp_path / "events.csv"
+    csv_path.write_text(content)
+    return parse_csv(str(csv_path), precision, use_parallel=False)
+
+
+def generated_csv() -> str:
+    csv_file = io.StringIO()
+    write_csv(csv_file, generate_rows(employees=15, awards_per_employee=2, events_per_award=20,
+                                      cancel_rate=0.25, performance_rate=0.1, decimals=3, seed=11))
+    return csv_file.getvalue()
+
+
+def build_service(engine: str, events, **options) -> VestingService:
+    service = VestingService(use_parallel=False, engine=engine, **options)
+    service.process_events(events)
+    return service
+
+
+@pytest.mark.parametrize("engine", sorted(CALCULATORS))
+class TestCalculatorConformance:
+    @pytest.mark.parametrize("fixture", sorted(FIXTURES))
+    def test_fixture_expectations(self, tmp_path, engine, fixture):
+        content, target_date, expected = FIXTURES[fixture]
+        service = build_service(engine, load_events(tmp_path, content, 0))
+
+        schedule = service.get_vesting_schedule(target_date)
+        assert {(employee_id, award_id): net for employee_id, _, award_id, net in schedule} == expected
+
+    @pytest.mark.parametrize("precision", [0, 1, 3, 6])
+    @pytest.mark.parametrize("content", [FRACTIONAL, WITH_CANCELLATIONS, generated_csv()],
+                             ids=["fractional", "with_cancellations", "generated"])
+    def test_matches_reference_engine(self, tmp_path, engine, precision, content):
+        events = load_events(tmp_path, content, precision)
+        target_dates = date_range(date(2019, 12, 1), date(2024, 12, 1), "month")
+
+        reference = build_service("default", events)
+        candidate = build_service(engine, events)
+
+        assert candidate.get_vesting_schedules(target_dates, precision) == \
+            reference.get_vesting_schedules(target_dates, precision)
+        assert candidate.get_vesting_schedule(date(2022, 6, 30), precision) == \
+            reference.get_vesting_schedule(date(2022, 6, 30), precision)
+
+    def test_calculator_accepts_plain_sequences_and_indexes(self, tmp_path, engine):
+        events = load_events(tmp_path, FRACTIONAL, 6)
+        reference, calculator = create_calculator("default"), create_calculator(engine)
+        by_kind = {
+            kind: [event for event in events if event.event_type == kind and event.employee_id == "E001"]
+            for kind in EventType
+        }
+
+        for target_date in [date(2019, 1, 1), date(2020, 2, 1), date(2020, 3, 15), date(2021, 1, 1)]:
+            for kind, method in [(EventType.VEST, "calculate_vested_shares"),
+                                 (EventType.CANCEL, "calculate_cancelled_shares"),
+                                 (EventType.PERFORMANCE, "calculate_performance_bonus")]:
+                expected = getattr(reference, method)(by_kind[kind], target_date)
+                assert getattr(calculator, method)(by_kind[kind], target_date) == expected
+                assert getattr(calculator, method)(EventIndex(list(by_kind[kind])), target_date) == expected
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_parallel_service_matches_reference(self, tmp_path, engine, executor):
+        events = load_events(tmp_path, generated_csv(), 3)
+        target_date = date(2022, 1, 1)
+
+        reference = build_service("default", events)
+        parallel = VestingService(use_parallel=True, max_workers=2, executor=executor, engine=engine)
+        parallel.process_events(events)
+
+        assert parallel.get_vesting_schedule(target_date, 3) == reference.get_vesting_schedule(target_date, 3)
+
+
+class TestCalculatorRegistry:
+    def test_cli_engines_match_registry(self):
+        assert set(ENGINES) == set(CALCULATORS)
+        assert DEFAULT_ENGINE in CALCULATORS
+
+    def test_unknown_engine_is_rejected(self):
+        with pytest.raises(ValueError, match="No calculator registered for engine: compiled"):
+            create_calculator("compiled")
+        with pytest.raises(ValueError):
+            VestingService(engine="compiled")
+
+    def test_service_assigns_engine_to_awards(self, tmp_path):
+        service = build_service("columnar", load_events(tmp_path, WITH_CANCELLATIONS, 0))
+        for employee in service.employees.values():
+            for award in employee.awards.values():
+                assert award._calculator is service.calculator
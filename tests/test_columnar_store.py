@@ -0,0 +1,96 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from models.award import Award
+from models.event import EventType
+from services.vesting_service import VestingService
+from utils import columnar_store
+from utils.columnar_store import ColumnarEventStore, to_fixed_point, from_fixed_point
+from utils.vesting_calculator import ColumnarVestingCalculator, DefaultVestingCalculator
+from tests.conftest import make_event
+
+
+EVENTS = [
+    make_event(EventType.VEST, "E002", "NSO-001", date(2020, 1, 2), "400"),
+    make_event(EventType.CANCEL, "E002", "NSO-001", date(2020, 2, 2), "200"),
+    make_event(EventType.VEST, "E002", "NSO-001", date(2020, 3, 2), "300.125"),
+    make_event(EventType.VEST, "E001", "ISO-001", date(2020, 1, 1), "1000.5"),
+    make_event(EventType.PERFORMANCE, "E001", "ISO-001", date(2020, 12, 31), "1.5"),
+    make_event(EventType.VEST, "E001", "ISO-002", date(2021, 1, 1), "10"),
+]
+
+
+class TestColumnarEventStore:
+    def test_fixed_point_round_trip(self):
+        assert to_fixed_point(Decimal("12.345678")) == 12345678
+        assert from_fixed_point(12345678) == Decimal("12.345678")
+
+        with pytest.raises(ValueError, match="more than 6 decimal places"):
+            to_fixed_point(Decimal("0.0000001"))
+
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_schedule_matches_service(self, monkeypatch, use_numpy):
+        if use_numpy and columnar_store._load_numpy() is None:
+            pytest.skip("numpy is not installed")
+        if not use_numpy:
+            monkeypatch.setattr(columnar_store, "_load_numpy", lambda: None)
+
+        service = VestingService(use_parallel=False)
+        service.process_events(EVENTS)
+        store = ColumnarEventStore.from_service(service)
+
+        assert len(store) == len(EVENTS)
+        for target_date in [date(2019, 1, 1), date(2020, 2, 2), date(2020, 12, 31), date(2021, 6, 1)]:
+            for precision in [0, 2]:
+                assert store.get_vesting_schedule(target_date, precision) == \
+                    service.get_vesting_schedule(target_date, precision)
+
+    def test_calculator_matches_default(self):
+        default_award = Award(award_id="NSO-001", employee_id="E002", employee_name="Employee E002")
+        columnar_award = Award(award_id="NSO-001", employee_id="E002", employee_name="Employee E002")
+        default_award.set_calculator(DefaultVestingCalculator())
+        columnar_award.set_calculator(ColumnarVestingCalculator())
+
+        for award in (default_award, columnar_award):
+            award.add_vested_event(EVENTS[0])
+            award.add_cancelled_event(EVENTS[1])
+            award.add_vested_event(EVENTS[2])
+
+        for target_date in [date(2020, 1, 1), date(2020, 2, 2), date(2020, 3, 2)]:
+            assert columnar_award.net_vested_shares(target_date) == default_award.net_vested_shares(target_date)
+
+    def test_calculator_extends_columns_for_tail_events(self):
+        award = Award(award_id="NSO-001", employee_id="E002", employee_name="Employee E002")
+        calculator = ColumnarVestingCalculator()
+        award.set_calculator(calculator)
+
+        award.add_vested_event(EVENTS[0])
+        assert award.total_vested_shares(date(2020, 12, 31)) == Decimal("400")
+        ordinals, _, _ = calculator._columns[award._vested_index]
+
+        award.add_vested_event(EVENTS[2])
+        assert award.total_vested_shares(date(2020, 12, 31)) == Decimal("700.125")
+        assert calculator._columns[award._vested_index][0] is ordinals
+
+        award.add_vested_event(make_event(EventType.VEST, "E002", "NSO-001", date(2020, 2, 1), "50"))
+        assert award.total_vested_shares(date(2020, 2, 15)) == Decimal("450")
+        assert award.total_vested_shares(date(2020, 12, 31)) == Decimal("750.125")
+
+    def test_service_renders_columnar_engine_from_store(self):
+        service = VestingService(use_parallel=False, engine="columnar")
+        service.process_events(EVENTS[:3])
+        first = service.get_vesting_schedule(date(2020, 12, 31), 3)
+
+        assert isinstance(service._columnar_store, ColumnarEventStore)
+        assert first == [("E002", "Employee E002", "NSO-001", Decimal("500.125"))]
+
+        service.process_events(EVENTS[3:])
+
+        assert service._columnar_store is None
+        assert service.get_vesting_schedules([date(2021, 6, 1)], 1)[date(2021, 6, 1)] == [
+            ("E001", "Employee E001", "ISO-001", Decimal("1500.7")),
+            ("E001", "Employee E001", "ISO-002", Decimal("10.0")),
+            ("E002", "Employee E002", "NSO-001", Decimal("500.1")),
+        ]
@@ -4,9 +4,9 @@ from datetime import date
 from decimal import Decimal
 import pytest
 
-from utils.csv_parser import parse_csv
+from utils.csv_parser import CSVProcessor, parse_csv, parse_csv_text
 from exceptions.parser_exceptions import CSVParserError
-from models.event import EventType
+from models.event import EventRecord, EventType
 
 class TestCSVParser:
     def setup_method(self):
@@ -88,3 +88,88 @@ class TestCSVParser:
 
         with pytest.raises(CSVParserError, match="Quantity must be positive"):
             parse_csv(self.temp_file.name)
+
+    def test_parse_csv_with_process_executor(self):
+        for day in range(1, 26):
+            self.temp_file.write(f"VEST,E001,Alice Smith,ISO-001,2020-02-{day:02d},{day}\n")
+        self.temp_file.flush()
+
+        events = parse_csv(self.temp_file.name, use_parallel=True, max_workers=2,
+                           chunk_size=5, executor="process")
+
+        assert len(events) == 25
+        assert [event.quantity for event in events] == [Decimal(day) for day in range(1, 26)]
+
+    def test_parse_csv_parallel_keeps_trailing_partial_chunk(self):
+        for day in range(1, 29):
+            self.temp_file.write(f"VEST,E001,Alice Smith,ISO-001,2020-02-{day:02d},{day}")
+            if day < 28:
+                self.temp_file.write("\n")
+        self.temp_file.flush()
+
+        events = parse_csv(self.temp_file.name, use_parallel=True, max_workers=3, chunk_size=5)
+
+        assert len(events) == 28
+        assert [event.quantity for event in events] == [Decimal(day) for day in range(1, 29)]
+
+    def test_parse_csv_parallel_reports_absolute_line_numbers(self):
+        for day in range(1, 29):
+            quantity = "abc" if day == 23 else day
+            self.temp_file.write(f"VEST,E001,Alice Smith,ISO-001,2020-02-{day:02d},{quantity}\n")
+        self.temp_file.flush()
+
+        with pytest.raises(CSVParserError, match=r"Invalid quantity: abc \(line 23\)"):
+            parse_csv(self.temp_file.name, use_parallel=True, max_workers=3, chunk_size=5)
+
+    def test_split_file_into_chunks_aligns_to_newlines(self):
+        for day in range(1, 29):
+            self.temp_file.write(f"VEST,E001,Alice Smith,ISO-001,2020-02-{day:02d},{day}\n")
+        self.temp_file.flush()
+
+        processor = CSVProcessor(chunk_size=4)
+        chunks = processor._split_file_into_chunks(self.temp_file.name)
+
+        with open(self.temp_file.name, 'rb') as csv_file:
+            data = csv_file.read()
+
+        assert len(chunks) > 1
+        assert chunks[0]['start_pos'] == 0
+        assert chunks[-1]['end_pos'] == len(data)
+        for previous, current in zip(chunks, chunks[1:]):
+            assert previous['end_pos'] == current['start_pos']
+            assert data[current['start_pos'] - 1:current['start_pos']] == b"\n"
+
+    def test_split_empty_file(self):
+        processor = CSVProcessor()
+
+        assert processor._split_file_into_chunks(self.temp_file.name) == []
+        assert parse_csv(self.temp_file.name, use_parallel=True) == []
+
+    def test_parse_csv_compact_events(self):
+        self.temp_file.write("VEST,E001,Alice Smith,ISO-001,2020-01-01,1000\n")
+        self.temp_file.write("VEST,E001,Alice Smith,ISO-002,2020-02-01,500\n")
+        self.temp_file.flush()
+
+        compact = parse_csv(self.temp_file.name, use_parallel=False)
+        full = parse_csv(self.temp_file.name, use_parallel=False, compact_events=False)
+
+        assert all(isinstance(event, EventRecord) for event in compact)
+        assert [event.to_event() for event in compact] == full
+        assert compact[0].employee_id is compact[1].employee_id
+
+    def test_parse_csv_quantity_rounded_to_zero(self):
+        self.temp_file.write("VEST,E001,Alice Smith,ISO-001,2020-01-01,0.4\n")
+        self.temp_file.flush()
+
+        with pytest.raises(CSVParserError, match="Quantity must be positive"):
+            parse_csv(self.temp_file.name, use_parallel=False)
+
+    def test_parse_csv_text_matches_file_parsing(self):
+        content = 'VEST,E001,"Smith, Alice",ISO-001,2020-01-01,1000\r\n\nVEST,E002,"Bobby\nJones",NSO-001,2020-01-02,5\n'
+        self.temp_file.write(content)
+        self.temp_file.flush()
+
+        events = parse_csv_text(content)
+
+        assert events == parse_csv(self.temp_file.name, use_parallel=False)
+        assert [event.employee_name for event in events] == ["Smith, Alice", "Bobby\nJones"]
@@ -0,0 +1,36 @@
+from datetime import date
+
+import pytest
+
+from utils.date_utils import add_months, date_range, parse_date
+
+
+class TestDateUtils:
+    def test_add_months_clamps_to_month_end(self):
+        assert add_months(date(2020, 1, 31), 1) == date(2020, 2, 29)
+        assert add_months(date(2020, 1, 31), 2) == date(2020, 3, 31)
+        assert add_months(date(2020, 11, 30), 3) == date(2021, 2, 28)
+
+    def test_date_range_by_month(self):
+        assert date_range(date(2020, 1, 31), date(2020, 4, 30), "month") == [
+            date(2020, 1, 31), date(2020, 2, 29), date(2020, 3, 31), date(2020, 4, 30)
+        ]
+
+    def test_date_range_by_week(self):
+        assert date_range(date(2020, 1, 1), date(2020, 1, 15), "week") == [
+            date(2020, 1, 1), date(2020, 1, 8), date(2020, 1, 15)
+        ]
+
+    def test_date_range_invalid(self):
+        with pytest.raises(ValueError, match="Invalid date step"):
+            date_range(date(2020, 1, 1), date(2020, 2, 1), "fortnight")
+        with pytest.raises(ValueError, match="is before start date"):
+            date_range(date(2020, 2, 1), date(2020, 1, 1))
+
+    def test_parse_date(self):
+        assert parse_date("2020-02-29") == date(2020, 2, 29)
+        assert parse_date("2020-2-9") == date(2020, 2, 9)
+
+        for value in ["01/01/2020", "20200101", "2020-02-30"]:
+            with pytest.raises(ValueError):
+                parse_date(value)
@@ -0,0 +1,31 @@
+from datetime import date
+from decimal import Decimal
+
+from models.event import EventRecord, EventType
+from utils.dedup import EventDeduplicator, event_key
+
+
+def make_record(quantity: str, award_id: str = "ISO-001") -> EventRecord:
+    return EventRecord(EventType.VEST, "E001", "Alice Smith", award_id, date(2020, 1, 1), Decimal(quantity))
+
+
+class TestEventDeduplicator:
+    def test_keys_are_exact_for_decimal_quantities(self):
+        assert event_key(make_record("0.000001")) != event_key(make_record("0.000002"))
+        assert event_key(make_record("1000")) == event_key(make_record("1000.00"))
+
+    def test_membership_is_scoped_per_award(self):
+        deduplicator = EventDeduplicator()
+
+        assert not deduplicator.contains(make_record("10"))
+        assert not deduplicator.contains(make_record("10"))
+        deduplicator.add(make_record("10"))
+        assert deduplicator.contains(make_record("10"))
+        assert not deduplicator.contains(make_record("10", award_id="ISO-002"))
+        deduplicator.add(make_record("10", award_id="ISO-002"))
+        assert set(deduplicator.keys) == {("E001", "ISO-001"), ("E001", "ISO-002")}
+
+        deduplicator.release(("E001", "ISO-001"))
+
+        assert ("E001", "ISO-001") not in deduplicator.keys
+        assert len(deduplicator) == 1
@@ -115,3 +115,17 @@ class TestEmployeeModel:
         assert sorted_awards[0].award_id == "ISO-001"
         assert sorted_awards[1].award_id == "ISO-002"
         assert sorted_awards[2].award_id == "ISO-003"
+
+    def test_sorted_award_ids_follow_direct_dict_changes(self):
+        employee = Employee(
+            employee_id="E001",
+            name="Alice Smith",
+            awards={
+                "ISO-002": Award(award_id="ISO-002", employee_id="E001", employee_name="Alice Smith"),
+            }
+        )
+
+        employee.add_award(Award(award_id="ISO-003", employee_id="E001", employee_name="Alice Smith"))
+        employee.awards["ISO-001"] = Award(award_id="ISO-001", employee_id="E001", employee_name="Alice Smith")
+
+        assert employee.sorted_award_ids() == ["ISO-001", "ISO-002", "ISO-003"]
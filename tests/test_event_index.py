@@ -0,0 +1,59 @@
+from datetime import date
+from decimal import Decimal
+
+from models.event import EventType
+from utils.event_index import EventIndex
+from utils.vesting_calculator import DefaultVestingCalculator, IndexedVestingCalculator
+from tests.conftest import make_event
+
+
+class TestEventIndex:
+    def test_empty_index(self):
+        index = EventIndex()
+
+        assert len(index) == 0
+        assert index.total_at(date(2020, 1, 1)) == Decimal("0")
+
+    def test_sorts_initial_events(self):
+        index = EventIndex([
+            make_event(EventType.VEST, "E001", "ISO-001", date(2020, 2, 1), "20"),
+            make_event(EventType.VEST, "E001", "ISO-001", date(2020, 1, 1), "10"),
+        ])
+
+        assert index.dates == [date(2020, 1, 1), date(2020, 2, 1)]
+        assert index.totals == [Decimal("10"), Decimal("30")]
+
+    def test_insert_in_middle_rebuilds_totals(self):
+        index = EventIndex([
+            make_event(EventType.VEST, "E001", "ISO-001", date(2020, 1, 1), "10"),
+            make_event(EventType.VEST, "E001", "ISO-001", date(2020, 3, 1), "30"),
+        ])
+
+        position = index.add(make_event(EventType.VEST, "E001", "ISO-001", date(2020, 2, 1), "20.5"))
+
+        assert position == 1
+        assert index.totals == [Decimal("10"), Decimal("30.5"), Decimal("60.5")]
+
+    def test_same_date_events_are_summed(self):
+        index = EventIndex()
+        index.add(make_event(EventType.VEST, "E001", "ISO-001", date(2020, 1, 1), "10"))
+        index.add(make_event(EventType.VEST, "E001", "ISO-001", date(2020, 1, 1), "5"))
+
+        assert index.total_at(date(2019, 12, 31)) == Decimal("0")
+        assert index.total_at(date(2020, 1, 1)) == Decimal("15")
+        assert index.count_at(date(2020, 1, 1)) == 2
+
+    def test_indexed_calculator_matches_default(self):
+        events = [
+            make_event(EventType.VEST, "E001", "ISO-001", date(2020, 3, 1), "1.25"),
+            make_event(EventType.VEST, "E001", "ISO-001", date(2020, 1, 1), "1000"),
+            make_event(EventType.VEST, "E001", "ISO-001", date(2020, 2, 1), "50.450"),
+        ]
+        default = DefaultVestingCalculator()
+        indexed = IndexedVestingCalculator()
+
+        for target_date in [date(2019, 1, 1), date(2020, 1, 1), date(2020, 2, 15), date(2021, 1, 1)]:
+            assert indexed.calculate_vested_shares(events, target_date) == \
+                default.calculate_vested_shares(events, target_date)
+            assert indexed.calculate_performance_bonus(events, target_date) == \
+                default.calculate_performance_bonus(events, target_date)
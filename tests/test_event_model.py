@@ -1,9 +1,10 @@
+import pickle
 from datetime import date
 from decimal import Decimal
 
 import pytest
 
-from models.event import Event, EventType
+from models.event import Event, EventRecord, EventType
 
 
 class TestEventModel:
@@ -87,3 +88,30 @@ class TestEventModel:
         )
 
         assert event.quantity == Decimal("10.501")
+
+
+class TestEventRecord:
+    def test_round_trip_with_event(self):
+        event = Event(
+            event_type=EventType.VEST,
+            employee_id="E001",
+            employee_name="Alice Smith",
+            award_id="ISO-001",
+            event_date=date(2020, 1, 1),
+            quantity=Decimal("1000")
+        )
+
+        record = EventRecord.from_event(event)
+
+        assert record.event_date == date(2020, 1, 1)
+        assert record.quantity == Decimal("1000")
+        assert record.to_event() == event
+
+    def test_pickle_and_equality(self):
+        record = EventRecord(EventType.CANCEL, "E001", "Alice Smith", "ISO-001", date(2020, 1, 1), Decimal("5"))
+
+        restored = pickle.loads(pickle.dumps(record))
+
+        assert restored == record
+        assert hash(restored) == hash(record)
+        assert not hasattr(restored, "__dict__")
@@ -0,0 +1,92 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from exceptions.vesting_exception import VestingValidationError
+from models.award import Award
+from models.event import EventType
+from processors.event_processor import find_invalid_cancel
+from services.vesting_service import build_award_group, process_award_group
+from tests.conftest import make_event
+
+
+def make_award() -> Award:
+    return Award(award_id="ISO-001", employee_id="E001", employee_name="Alice Smith")
+
+
+class TestFindInvalidCancel:
+    def test_running_balance_within_group(self):
+        events = [
+            make_event(EventType.VEST, "E001", "ISO-001", date(2020, 1, 1), "100"),
+            make_event(EventType.CANCEL, "E001", "ISO-001", date(2020, 2, 1), "50"),
+            make_event(EventType.PERFORMANCE, "E001", "ISO-001", date(2020, 2, 15), "2"),
+            make_event(EventType.VEST, "E001", "ISO-001", date(2020, 3, 1), "10"),
+            make_event(EventType.CANCEL, "E001", "ISO-001", date(2020, 4, 1), "60"),
+        ]
+        assert find_invalid_cancel(events, make_award()) is None
+        events.append(make_event(EventType.CANCEL, "E001", "ISO-001", date(2020, 5, 1), "1"))
+        assert find_invalid_cancel(events, make_award()) == 5
+
+    def test_counts_events_already_on_the_award(self):
+        award = make_award()
+        award.add_vested_event(make_event(EventType.VEST, "E001", "ISO-001", date(2020, 1, 1), "100"))
+        award.add_vested_event(make_event(EventType.VEST, "E001", "ISO-001", date(2020, 6, 1), "500"))
+        award.add_cancelled_event(make_event(EventType.CANCEL, "E001", "ISO-001", date(2020, 1, 15), "10"))
+
+        events = [
+            make_event(EventType.CANCEL, "E001", "ISO-001", date(2020, 2, 1), "80"),
+            make_event(EventType.CANCEL, "E001", "ISO-001", date(2020, 3, 1), "20"),
+        ]
+        assert find_invalid_cancel(events, award) == 1
+
+    def test_cancel_before_same_day_vest_is_invalid(self):
+        events = [
+            make_event(EventType.CANCEL, "E001", "ISO-001", date(2020, 1, 1), "10"),
+            make_event(EventType.VEST, "E001", "ISO-001", date(2020, 1, 1), "100"),
+        ]
+        assert find_invalid_cancel(events, make_award()) == 0
+
+
+class TestProcessAwardGroup:
+    def test_applies_events_up_to_the_invalid_cancel(self):
+        award = make_award()
+        events = [
+            make_event(EventType.VEST, "E001", "ISO-001", date(2020, 1, 1), "100"),
+            make_event(EventType.CANCEL, "E001", "ISO-001", date(2020, 2, 1), "50"),
+            make_event(EventType.VEST, "E001", "ISO-001", date(2020, 3, 1), "10"),
+            make_event(EventType.CANCEL, "E001", "ISO-001", date(2020, 4, 1), "70"),
+            make_event(EventType.VEST, "E001", "ISO-001", date(2020, 5, 1), "5"),
+        ]
+
+        with pytest.raises(VestingValidationError, match="Cannot cancel more shares than vested"):
+            process_award_group((("E001", "ISO-001"), award, events))
+
+        assert [event.quantity for event in award.vested_events] == [Decimal("100"), Decimal("10")]
+        assert [event.quantity for event in award.cancelled_events] == [Decimal("50")]
+
+    def test_many_cancels_match_incremental_totals(self):
+        events = []
+        for month in range(1, 13):
+            events.append(make_event(EventType.VEST, "E001", "ISO-001", date(2020, month, 1), "100"))
+            events.append(make_event(EventType.CANCEL, "E001", "ISO-001", date(2020, month, 15), "40"))
+
+        _, award = process_award_group((("E001", "ISO-001"), make_award(), events))
+        assert award.total_cancelled_shares(date(2020, 12, 31)) == Decimal("480")
+        assert award.net_vested_shares(date(2020, 12, 31)) == Decimal("720")
+
+    def test_build_award_group_returns_sorted_positions_and_totals(self):
+        award = make_award()
+        award.add_vested_event(make_event(EventType.VEST, "E001", "ISO-001", date(2020, 1, 1), "100"))
+        events = [
+            make_event(EventType.VEST, "E001", "ISO-001", date(2020, 3, 1), "10"),
+            make_event(EventType.CANCEL, "E001", "ISO-001", date(2020, 2, 1), "60"),
+            make_event(EventType.PERFORMANCE, "E001", "ISO-001", date(2020, 2, 15), "2"),
+            make_event(EventType.CANCEL, "E001", "ISO-001", date(2020, 4, 1), "60"),
+        ]
+
+        _, positions, totals, rejected = build_award_group((("E001", "ISO-001"), events, award.running_totals()))
+
+        assert positions == ([0], [1], [2])
+        assert totals == ([Decimal("110")], [Decimal("60")], [Decimal("2")])
+        assert rejected == 3
@@ -0,0 +1,33 @@
+import io
+
+from benchmarks.generator import generate_rows, write_csv
+from models.event import EventType
+from services.vesting_service import VestingService
+from utils.csv_parser import parse_csv
+
+
+class TestGenerator:
+    def test_output_is_deterministic_for_a_seed(self):
+        first, second, other = io.StringIO(), io.StringIO(), io.StringIO()
+        write_csv(first, generate_rows(employees=20, seed=7))
+        write_csv(second, generate_rows(employees=20, seed=7))
+        write_csv(other, generate_rows(employees=20, seed=8))
+
+        assert first.getvalue() == second.getvalue()
+        assert first.getvalue() != other.getvalue()
+
+    def test_generated_events_are_valid(self, tmp_path):
+        csv_path = tmp_path / "events.csv"
+        with open(csv_path, "w") as csv_file:
+            rows = write_csv(csv_file, generate_rows(employees=50, awards_per_employee=3, events_per_award=30,
+                                                     cancel_rate=0.3, performance_rate=0.1, seed=3),
+                             sort_by_date=True)
+
+        events = parse_csv(str(csv_path), precision=2, use_parallel=False)
+        assert len(events) == rows == 50 * 3 * 30
+        assert {event.event_type for event in events} == set(EventType)
+        assert [event.event_date for event in events] == sorted(event.event_date for event in events)
+
+        service = VestingService(use_parallel=False)
+        service.process_events(events, presorted=True)
+        assert sum(len(employee.awards) for employee in service.employees.values()) == 150
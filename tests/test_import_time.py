@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFERRED_MODULES = (
+    "pydantic", "numpy", "asyncio", "concurrent.futures", "cProfile", "json",
+    "models.event", "models.award", "services.vesting_service", "utils.csv_parser", "vesting_schedule.server",
+)
+
+
+def imported_modules(*args: str) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60
+    )
+    modules = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class TestImportTime:
+    def test_cli_module_defers_heavy_imports(self):
+        modules = imported_modules("-c", "import vesting_schedule.main")
+        assert "vesting_schedule.main" in modules
+        assert [name for name in DEFERRED_MODULES if name in modules] == []
+
+    @pytest.mark.parametrize("args", [["--help"], ["events.csv", "not-a-date"], ["events.csv", "2020-01-01", "9"]])
+    def test_help_and_argument_errors_skip_the_model_graph(self, args):
+        modules = imported_modules("-m", "vesting_schedule.main", *args)
+        assert [name for name in DEFERRED_MODULES if name in modules] == []
+
+    def test_calculators_do_not_import_numpy(self):
+        modules = imported_modules("-c", "import models.award")
+        assert "numpy" not in modules
@@ -0,0 +1,87 @@
+import os
+import sys
+import tempfile
+from decimal import Decimal
+
+import pytest
+
+from exceptions.parser_exceptions import CSVParserError
+from utils.csv_parser import stream_csv
+from utils.ingest_state import IngestState, complete_lines_end
+from vesting_schedule.main import main
+
+FIRST_ROWS = "VEST,E001,Alice Smith,ISO-001,2020-01-01,1000\nVEST,E001,Alice Smith,ISO-001,2020-02-01,500\n"
+NEW_ROW = "VEST,E002,Bobby Jones,NSO-001,2020-03-01,300\n"
+
+
+class TestIngestState:
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.temp_dir.name, "events.csv")
+        self.state_path = os.path.join(self.temp_dir.name, "state.json")
+        with open(self.csv_path, "w") as csv_file:
+            csv_file.write(FIRST_ROWS)
+
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+
+    def append(self, text: str) -> None:
+        with open(self.csv_path, "a") as csv_file:
+            csv_file.write(text)
+
+    def test_complete_lines_end_ignores_partial_row(self):
+        assert complete_lines_end(self.csv_path) == len(FIRST_ROWS)
+
+        self.append("VEST,E002,Bob")
+
+        assert complete_lines_end(self.csv_path) == len(FIRST_ROWS)
+
+    def test_resume_reads_only_appended_rows(self):
+        state = IngestState.load(self.state_path)
+        assert state.resume_offset(self.csv_path) == 0
+
+        state.record(self.csv_path, complete_lines_end(self.csv_path))
+        state.save()
+        self.append(NEW_ROW)
+
+        restored = IngestState.load(self.state_path)
+        start_offset = restored.resume_offset(self.csv_path)
+        events = list(stream_csv(self.csv_path, start_offset=start_offset,
+                                 end_offset=complete_lines_end(self.csv_path)))
+
+        assert start_offset == len(FIRST_ROWS)
+        assert len(events) == 1
+        assert events[0].employee_id == "E002"
+        assert events[0].quantity == Decimal("300")
+
+    def test_rewritten_file_is_rejected(self):
+        state = IngestState(self.state_path)
+        state.record(self.csv_path, complete_lines_end(self.csv_path))
+
+        with open(self.csv_path, "w") as csv_file:
+            csv_file.write(FIRST_ROWS.replace("1000", "2000"))
+
+        with pytest.raises(CSVParserError, match="File changed since it was last ingested"):
+            state.resume_offset(self.csv_path)
+
+    def test_cli_defers_truncated_row_until_it_is_completed(self, monkeypatch, capsys):
+        snapshot_path = os.path.join(self.temp_dir.name, "state.snapshot")
+        arguments = ["vesting_schedule", self.csv_path, "2020-12-31", "--ingest-state", self.state_path,
+                     "--snapshot-out", snapshot_path]
+        self.append("VEST,E002,Bobby Jones,NSO-001,2020-03-01,3")
+
+        monkeypatch.setattr(sys, "argv", arguments)
+        main()
+        first = capsys.readouterr()
+
+        assert "E002" not in first.out
+        assert "deferred to the next --ingest-state run" in first.err
+        assert IngestState.load(self.state_path).resume_offset(self.csv_path) == len(FIRST_ROWS)
+
+        self.append("00\n")
+        monkeypatch.setattr(sys, "argv", arguments + ["--snapshot-in", snapshot_path])
+        main()
+        second = capsys.readouterr()
+
+        assert "E002,Bobby Jones,NSO-001,300" in second.out
+        assert second.err == ""
@@ -0,0 +1,72 @@
+from datetime import date
+from decimal import Decimal
+from threading import RLock
+
+import pytest
+
+from models.event import Event, EventType
+from services.vesting_service import VestingService
+from utils.instrumentation import Instrumentation, metrics
+
+
+@pytest.fixture
+def enabled_metrics():
+    metrics.enable()
+    yield metrics
+    metrics.disable()
+    metrics.reset()
+
+
+class TestInstrumentation:
+    def test_disabled_instrumentation_records_nothing(self):
+        instrumentation = Instrumentation()
+        lock = RLock()
+
+        with instrumentation.phase("parse"):
+            pass
+        assert instrumentation.timed_lock(lock, "award") is lock
+        assert instrumentation.report()["phases"] == {}
+        assert instrumentation.report()["wall_seconds"] is None
+
+    def test_phases_counters_and_hooks(self):
+        instrumentation = Instrumentation()
+        instrumentation.enable()
+        seen = []
+        instrumentation.add_hook(lambda name, seconds: seen.append(name))
+
+        with instrumentation.phase("parse"):
+            pass
+        with instrumentation.phase("parse"):
+            pass
+        with instrumentation.timed_lock(RLock(), "award"):
+            pass
+        instrumentation.count("rows", 3)
+        instrumentation.count("rows")
+
+        report = instrumentation.report()
+        assert report["phases"]["parse"]["calls"] == 2
+        assert report["counters"] == {"rows": 4}
+        assert "award" in report["lock_wait_seconds"]
+        assert seen == ["parse", "parse"]
+
+    def test_service_reports_dedup_and_cache_counters(self, enabled_metrics):
+        event = Event(
+            event_type=EventType.VEST,
+            employee_id="E001",
+            employee_name="Alice Smith",
+            award_id="ISO-001",
+            event_date=date(2020, 1, 1),
+            quantity=Decimal("100")
+        )
+        service = VestingService(use_parallel=False)
+        service.process_events([event, event])
+        service.get_vesting_schedule(date(2020, 6, 1))
+        service.get_vesting_schedule(date(2020, 6, 1))
+
+        report = enabled_metrics.report()
+        assert report["counters"]["events.received"] == 2
+        assert report["counters"]["events.deduped"] == 1
+        assert report["counters"]["schedule_cache.misses"] == 1
+        assert report["counters"]["schedule_cache.hits"] == 1
+        assert report["counters"]["award.cache.misses"] > 0
+        assert report["phases"]["service.process_events"]["calls"] == 1
@@ -0,0 +1,69 @@
+import gzip
+import io
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from utils.output_writer import ScheduleWriter, format_net_vested, open_output
+
+
+class TestFormatNetVested:
+    def test_formats_without_float_rounding(self):
+        assert format_net_vested(Decimal("12345678901234567.123456"), 6) == "12345678901234567.123456"
+        assert format_net_vested(Decimal("1000"), 0) == "1000"
+        assert format_net_vested(Decimal("1.5"), 2) == "1.50"
+
+    def test_negative_zero_is_printed_as_zero(self):
+        assert format_net_vested(Decimal("-0"), 0) == "0"
+        assert format_net_vested(Decimal("-0.00"), 2) == "0.00"
+
+
+class TestScheduleWriter:
+    def test_writes_rows_in_blocks(self):
+        stream = io.StringIO()
+        writer = ScheduleWriter(stream, precision=1, block_rows=2)
+        writer.write_rows([
+            ("E001", "Alice Smith", "ISO-001", Decimal("1000.0")),
+            ("E001", "Alice Smith", "ISO-002", Decimal("0.5")),
+            ("E002", "Bobby Jones", "NSO-001", Decimal("300.0")),
+        ])
+        assert writer.rows_written == 2
+
+        writer.flush()
+        assert writer.rows_written == 3
+        assert stream.getvalue() == (
+            "E001,Alice Smith,ISO-001,1000.0\n"
+            "E001,Alice Smith,ISO-002,0.5\n"
+            "E002,Bobby Jones,NSO-001,300.0\n"
+        )
+
+    def test_prefixes_schedule_date(self):
+        stream = io.StringIO()
+        writer = ScheduleWriter(stream)
+        writer.write_rows([("E001", "Alice Smith", "ISO-001", Decimal("10"))], date(2020, 1, 1))
+        writer.flush()
+        assert stream.getvalue() == "2020-01-01,E001,Alice Smith,ISO-001,10\n"
+
+    def test_rejects_invalid_block_size(self):
+        with pytest.raises(ValueError):
+            ScheduleWriter(io.StringIO(), block_rows=0)
+
+
+class TestOpenOutput:
+    @pytest.mark.parametrize("file_name, compress", [("out.csv.gz", False), ("out.csv", True)])
+    def test_gzip_output(self, tmp_path, file_name, compress):
+        output_path = tmp_path / file_name
+        with open_output(str(output_path), compress=compress) as output:
+            writer = ScheduleWriter(output)
+            writer.write_rows([("E001", "Alice Smith", "ISO-001", Decimal("10"))])
+            writer.flush()
+
+        with gzip.open(output_path, "rt") as compressed:
+            assert compressed.read() == "E001,Alice Smith,ISO-001,10\n"
+
+    def test_plain_file_output(self, tmp_path):
+        output_path = tmp_path / "out.csv"
+        with open_output(str(output_path)) as output:
+            output.write("E001,Alice Smith,ISO-001,10\n")
+        assert output_path.read_text() == "E001,Alice Smith,ISO-001,10\n"
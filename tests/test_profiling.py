@@ -0,0 +1,42 @@
+import pstats
+import sys
+
+import pytest
+
+from utils.concurrency_utils import parallel_map
+from utils.instrumentation import metrics
+from utils.profiling import profiling
+
+
+def _square_in_worker(value: int) -> int:
+    return value * value
+
+
+class TestProfiling:
+    @pytest.mark.skipif(sys.version_info < (3, 12), reason="cProfile sees other threads from Python 3.12")
+    def test_cpu_profile_includes_worker_threads(self, tmp_path, capsys):
+        output_path = tmp_path / "run.prof"
+        with profiling("cpu", str(output_path)):
+            assert parallel_map(_square_in_worker, [1, 2, 3], max_workers=2) == [1, 4, 9]
+
+        stats = pstats.Stats(str(output_path))
+        functions = {function_name for _, _, function_name in stats.stats}
+        assert "_square_in_worker" in functions
+        assert "(all threads profiled)" in capsys.readouterr().err
+
+    def test_memory_profile_reports_cli_phases(self, tmp_path):
+        output_path = tmp_path / "memory.txt"
+        with profiling("mem", str(output_path), top=3):
+            with metrics.phase("cli.ingest"):
+                allocated = [bytearray(1024) for _ in range(100)]
+
+        report = output_path.read_text()
+        assert "Traced memory" in report
+        assert "allocation sites during cli.ingest" in report
+        assert not metrics.enabled
+        assert allocated
+
+    def test_rejects_unknown_mode(self):
+        with pytest.raises(ValueError):
+            with profiling("wall"):
+                pass
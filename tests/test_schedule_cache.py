@@ -0,0 +1,86 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from models.event import EventType
+from services.schedule_cache import ScheduleCache
+from services.vesting_service import VestingService
+from tests.conftest import make_event
+
+
+class TestScheduleCache:
+    def test_lru_eviction_and_counters(self):
+        cache = ScheduleCache(maxsize=2)
+        cache.put((date(2020, 1, 1), 0), [])
+        cache.put((date(2020, 2, 1), 0), [])
+
+        assert cache.get((date(2020, 1, 1), 0)) is not None
+        cache.put((date(2020, 3, 1), 0), [])
+
+        assert (date(2020, 2, 1), 0) not in cache
+        assert (date(2020, 1, 1), 0) in cache
+        assert cache.get((date(2020, 2, 1), 0)) is None
+        assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 1, "misses": 1, "refreshes": 0}
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError, match="must be positive"):
+            ScheduleCache(maxsize=0)
+
+    def test_service_refreshes_only_affected_dates(self):
+        service = VestingService(use_parallel=False)
+        service.process_events([
+            make_event(EventType.VEST, "E001", "ISO-001", date(2020, 1, 1), "1000"),
+            make_event(EventType.VEST, "E002", "NSO-001", date(2020, 1, 1), "500"),
+        ])
+        early, late = date(2020, 1, 31), date(2020, 12, 31)
+        early_schedule = service.get_vesting_schedule(early)
+        late_schedule = service.get_vesting_schedule(late)
+
+        service.process_events([make_event(EventType.CANCEL, "E002", "NSO-001", date(2020, 6, 1), "200")])
+
+        assert service.get_vesting_schedule(early) is early_schedule
+        refreshed = service.get_vesting_schedule(late)
+        assert refreshed is not late_schedule
+        assert refreshed == [
+            ("E001", "Employee E001", "ISO-001", Decimal("1000")),
+            ("E002", "Employee E002", "NSO-001", Decimal("300")),
+        ]
+        assert late_schedule[1][3] == Decimal("500")
+        assert service.cache_stats()["refreshes"] == 1
+
+    def test_service_new_award_clears_cache(self):
+        service = VestingService(use_parallel=False)
+        service.process_events([make_event(EventType.VEST, "E001", "ISO-001", date(2020, 1, 1), "1000")])
+        service.get_vesting_schedule(date(2020, 1, 31))
+
+        service.process_events([make_event(EventType.VEST, "E003", "ISO-009", date(2020, 6, 1), "10")])
+
+        assert service.get_vesting_schedule(date(2020, 1, 31)) == [
+            ("E001", "Employee E001", "ISO-001", Decimal("1000")),
+            ("E003", "Employee E003", "ISO-009", Decimal("0")),
+        ]
+
+    def test_multi_date_schedules_reuse_cached_dates(self):
+        service = VestingService(use_parallel=False)
+        service.process_events([
+            make_event(EventType.VEST, "E001", "ISO-001", date(2020, 1, 1), "1000"),
+            make_event(EventType.VEST, "E002", "NSO-001", date(2020, 1, 1), "500"),
+        ])
+        target_dates = [date(2020, month, 1) for month in range(1, 13)]
+
+        first = service.get_vesting_schedules(target_dates)
+        assert service.cache_stats()["misses"] == 12
+
+        second = service.get_vesting_schedules(target_dates)
+        assert service.cache_stats() == {"size": 12, "maxsize": 256, "hits": 12, "misses": 12, "refreshes": 0}
+        assert all(second[target_date] is first[target_date] for target_date in target_dates)
+
+        service.process_events([make_event(EventType.CANCEL, "E002", "NSO-001", date(2020, 6, 15), "200")])
+        third = service.get_vesting_schedules(target_dates + [date(2021, 1, 1)])
+
+        assert service.cache_stats()["refreshes"] == 6
+        assert service.cache_stats()["misses"] == 13
+        assert third[date(2020, 6, 1)] is first[date(2020, 6, 1)]
+        assert third[date(2020, 7, 1)][1][3] == Decimal("300")
+        assert third[date(2021, 1, 1)][1][3] == Decimal("300")
@@ -0,0 +1,139 @@
+import asyncio
+import json
+from datetime import date
+from decimal import Decimal
+
+from models.event import Event, EventType
+from services.vesting_service import VestingService
+from vesting_schedule.server import VestingServer
+
+
+async def request(port: int, method: str, target: str, body: bytes = b"",
+                  content_length: str = None, headers: str = None) -> tuple:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    content_length = str(len(body)) if content_length is None else content_length
+    if headers is None:
+        headers = f"Content-Length: {content_length}\r\n"
+    writer.write(
+        f"{method} {target} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+        f"{headers}\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+
+    head, _, payload = response.partition(b"\r\n\r\n")
+    status = int(head.split(b" ")[1])
+    return status, json.loads(payload)
+
+
+def run_with_server(scenario):
+    service = VestingService(use_parallel=False)
+    service.process_events([
+        Event(
+            event_type=EventType.VEST,
+            employee_id="E001",
+            employee_name="Alice Smith",
+            award_id="ISO-001",
+            event_date=date(2020, 1, 1),
+            quantity=Decimal("1000")
+        )
+    ])
+    server = VestingServer(service)
+
+    async def main():
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            return await scenario(port)
+        finally:
+            listener.close()
+            await listener.wait_closed()
+
+    try:
+        return asyncio.run(main())
+    finally:
+        server.close()
+
+
+class TestVestingServer:
+    def test_schedule_and_ingest(self):
+        async def scenario(port):
+            status, schedule = await request(port, "GET", "/schedule?date=2020-06-01&precision=1")
+            assert status == 200
+            assert schedule == [{"employee_id": "E001", "employee_name": "Alice Smith",
+                                 "award_id": "ISO-001", "net_vested": "1000.0"}]
+
+            status, result = await request(port, "POST", "/events",
+                                           b"CANCEL,E001,Alice Smith,ISO-001,2020-02-01,400\n")
+            assert status == 200
+            assert result == {"received": 1}
+
+            status, schedule = await request(port, "GET", "/employees/E001?date=2020-06-01")
+            assert status == 200
+            assert schedule[0]["net_vested"] == "600"
+
+            status, schedule = await request(port, "GET", "/awards/ISO-001?date=2020-06-01")
+            assert status == 200
+            assert schedule[0]["employee_id"] == "E001"
+
+        run_with_server(scenario)
+
+    def test_errors(self):
+        async def scenario(port):
+            status, payload = await request(port, "GET", "/schedule")
+            assert status == 400
+            assert payload["error"] == "Missing query parameter: date"
+
+            status, payload = await request(port, "POST", "/events",
+                                            b"CANCEL,E001,Alice Smith,ISO-001,2020-02-01,5000\n")
+            assert status == 400
+            assert "Cannot cancel more shares than vested" in payload["error"]
+
+            status, payload = await request(port, "GET", "/employees/E999?date=2020-06-01")
+            assert status == 404
+
+            status, payload = await request(port, "GET", "/awards/NSO-404?date=2020-06-01")
+            assert status == 404
+
+            status, payload = await request(port, "DELETE", "/schedule")
+            assert status == 404
+
+            status, payload = await request(port, "POST", "/events?precision=9",
+                                            b"VEST,E001,Alice Smith,ISO-001,2020-02-01,5\n")
+            assert status == 400
+            assert payload["error"] == "Precision must be between 0 and 6, got 9"
+
+            for content_length in ("abc", "-5"):
+                status, payload = await request(port, "POST", "/events", content_length=content_length)
+                assert status == 400
+                assert payload["error"] == "Invalid Content-Length"
+
+        run_with_server(scenario)
+
+    def test_ingest_keeps_quoted_newlines_in_fields(self):
+        async def scenario(port):
+            status, result = await request(port, "POST", "/events",
+                                           b'VEST,E002,"Bobby\nJones",NSO-001,2020-01-02,300\r\n')
+            assert status == 200
+            assert result == {"received": 1}
+
+            status, schedule = await request(port, "GET", "/employees/E002?date=2020-06-01")
+            assert status == 200
+            assert schedule[0]["employee_name"] == "Bobby\nJones"
+            assert schedule[0]["net_vested"] == "300"
+
+        run_with_server(scenario)
+
+    def test_chunked_body_is_rejected(self):
+        async def scenario(port):
+            body = b"2e\r\nVEST,E001,Alice Smith,ISO-001,2020-02-01,500\n\r\n0\r\n\r\n"
+            status, payload = await request(port, "POST", "/events", body,
+                                            headers="Transfer-Encoding: chunked\r\n")
+            assert status == 411
+            assert "Content-Length" in payload["error"]
+
+            status, schedule = await request(port, "GET", "/employees/E001?date=2020-06-01")
+            assert schedule[0]["net_vested"] == "1000"
+
+        run_with_server(scenario)
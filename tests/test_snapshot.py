@@ -0,0 +1,69 @@
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from exceptions.snapshot_exception import SnapshotError
+from models.event import EventType
+from services.snapshot import load_snapshot, save_snapshot
+from services.vesting_service import VestingService
+from tests.conftest import make_event
+
+
+EVENTS = [
+    make_event(EventType.VEST, "E001", "ISO-001", date(2020, 1, 1), "1000"),
+    make_event(EventType.VEST, "E001", "ISO-001", date(2021, 1, 1), "1000.50"),
+    make_event(EventType.PERFORMANCE, "E001", "ISO-001", date(2021, 6, 1), "1.5"),
+    make_event(EventType.VEST, "E002", "NSO-001", date(2020, 1, 2), "400"),
+    make_event(EventType.CANCEL, "E002", "NSO-001", date(2020, 2, 2), "200.125"),
+]
+
+
+class TestSnapshot:
+    def setup_method(self):
+        handle, self.path = tempfile.mkstemp(suffix=".vsnp")
+        os.close(handle)
+
+    def teardown_method(self):
+        os.unlink(self.path)
+
+    def test_round_trip(self):
+        service = VestingService(use_parallel=False)
+        service.process_events(EVENTS)
+
+        save_snapshot(service, self.path)
+        restored = load_snapshot(self.path, use_parallel=False)
+
+        for target_date in [date(2019, 12, 31), date(2020, 2, 2), date(2021, 12, 31)]:
+            assert restored.get_vesting_schedule(target_date, 3) == service.get_vesting_schedule(target_date, 3)
+
+        award = restored.employees["E002"].awards["NSO-001"]
+        assert award.cancelled_events[0].quantity == Decimal("200.125")
+        assert str(award.cancelled_events[0].quantity) == "200.125"
+        assert restored._processed_events.keys == service._processed_events.keys
+
+    def test_apply_new_events_after_load(self):
+        service = VestingService(use_parallel=False)
+        service.process_events(EVENTS)
+        save_snapshot(service, self.path)
+
+        restored = load_snapshot(self.path, use_parallel=False)
+        restored.process_events(EVENTS + [
+            make_event(EventType.CANCEL, "E001", "ISO-001", date(2022, 1, 1), "500")
+        ])
+
+        award = restored.employees["E001"].awards["ISO-001"]
+        assert len(award.vested_events) == 2
+        assert award.net_vested_shares(date(2022, 1, 1)) == Decimal("2250.75")
+
+    def test_rejects_invalid_files(self):
+        with open(self.path, "wb") as snapshot_file:
+            snapshot_file.write(b"not a snapshot at all, just some bytes")
+
+        with pytest.raises(SnapshotError, match="Not a vesting snapshot"):
+            load_snapshot(self.path)
+
+        with pytest.raises(SnapshotError, match="Snapshot not found"):
+            load_snapshot(self.path + ".missing")
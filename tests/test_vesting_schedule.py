@@ -1,10 +1,13 @@
+import sys
 from datetime import date
 from decimal import Decimal
 import pytest
 
+from models.employee import Employee
 from models.event import Event, EventType
 from services.vesting_service import VestingService
 from exceptions.vesting_exception import VestingValidationError
+from vesting_schedule.main import main
 
 class TestVestingService:
     def test_process_vest_events(self):
@@ -189,3 +192,264 @@ class TestVestingService:
 
         assert len(schedule) == 1
         assert schedule[0] == ("E001", "Alice Smith", "ISO-001", Decimal("700"))
+
+    def test_get_vesting_schedules_matches_single_date(self):
+        service = VestingService()
+
+        events = [
+            Event(
+                event_type=EventType.VEST,
+                employee_id="E001",
+                employee_name="Alice Smith",
+                award_id="ISO-001",
+                event_date=date(2020, 1, 1),
+                quantity=Decimal("1000")
+            ),
+            Event(
+                event_type=EventType.CANCEL,
+                employee_id="E001",
+                employee_name="Alice Smith",
+                award_id="ISO-001",
+                event_date=date(2020, 3, 1),
+                quantity=Decimal("300")
+            ),
+            Event(
+                event_type=EventType.PERFORMANCE,
+                employee_id="E001",
+                employee_name="Alice Smith",
+                award_id="ISO-001",
+                event_date=date(2020, 6, 1),
+                quantity=Decimal("1.5")
+            ),
+            Event(
+                event_type=EventType.VEST,
+                employee_id="E002",
+                employee_name="John Small",
+                award_id="NSO-001",
+                event_date=date(2020, 2, 1),
+                quantity=Decimal("100")
+            )
+        ]
+
+        service.process_events(events)
+        target_dates = [date(2020, 6, 30), date(2019, 12, 31), date(2020, 1, 31), date(2020, 3, 1)]
+        schedules = service.get_vesting_schedules(target_dates)
+
+        assert list(schedules.keys()) == sorted(target_dates)
+        for target_date in target_dates:
+            fresh = VestingService()
+            fresh.process_events(events)
+            assert schedules[target_date] == fresh.get_vesting_schedule(target_date)
+
+        assert schedules[date(2020, 6, 30)][0] == ("E001", "Alice Smith", "ISO-001", Decimal("1050"))
+
+    def test_process_events_with_process_executor(self):
+        events = [
+            Event(
+                event_type=EventType.VEST,
+                employee_id=f"E00{employee}",
+                employee_name="Alice Smith",
+                award_id=f"ISO-00{award}",
+                event_date=date(2020, month, 1),
+                quantity=Decimal("100")
+            )
+            for employee in range(1, 4)
+            for award in range(1, 3)
+            for month in range(1, 7)
+        ]
+        events.append(Event(
+            event_type=EventType.CANCEL,
+            employee_id="E001",
+            employee_name="Alice Smith",
+            award_id="ISO-001",
+            event_date=date(2020, 6, 15),
+            quantity=Decimal("250")
+        ))
+
+        threaded = VestingService(use_parallel=True, max_workers=2)
+        threaded.process_events(events)
+        processes = VestingService(use_parallel=True, max_workers=2, executor="process")
+        processes.process_events(events)
+
+        target_date = date(2020, 12, 31)
+        assert processes.get_vesting_schedule(target_date) == threaded.get_vesting_schedule(target_date)
+        assert processes.employees["E001"].awards["ISO-001"].net_vested_shares(target_date) == Decimal("350")
+
+        later = [
+            Event(
+                event_type=EventType.VEST,
+                employee_id="E001",
+                employee_name="Alice Smith",
+                award_id="ISO-001",
+                event_date=date(2020, 8, 1),
+                quantity=Decimal("50")
+            ),
+            Event(
+                event_type=EventType.VEST,
+                employee_id="E002",
+                employee_name="Alice Smith",
+                award_id="ISO-001",
+                event_date=date(2020, 3, 15),
+                quantity=Decimal("7")
+            ),
+            Event(
+                event_type=EventType.CANCEL,
+                employee_id="E003",
+                employee_name="Alice Smith",
+                award_id="ISO-002",
+                event_date=date(2020, 9, 1),
+                quantity=Decimal("601")
+            ),
+        ]
+        for service in (threaded, processes):
+            with pytest.raises(VestingValidationError, match="Cannot cancel more shares than vested"):
+                service.process_events(later)
+
+        assert processes.get_vesting_schedule(target_date) == threaded.get_vesting_schedule(target_date)
+        assert processes.employees["E001"].awards["ISO-001"].net_vested_shares(target_date) == Decimal("400")
+        assert processes.employees["E002"].awards["ISO-001"].net_vested_shares(target_date) == Decimal("607")
+
+    def test_process_event_stream_presorted_in_batches(self):
+        events = [
+            Event(
+                event_type=EventType.VEST,
+                employee_id="E001",
+                employee_name="Alice Smith",
+                award_id="ISO-001",
+                event_date=date(2020, month, 1),
+                quantity=Decimal("100")
+            )
+            for month in range(1, 11)
+        ]
+        events.append(Event(
+            event_type=EventType.CANCEL,
+            employee_id="E001",
+            employee_name="Alice Smith",
+            award_id="ISO-001",
+            event_date=date(2020, 11, 1),
+            quantity=Decimal("950")
+        ))
+
+        service = VestingService(use_parallel=False)
+        service.process_event_stream(iter(events), batch_size=3, presorted=True)
+
+        assert service.get_vesting_schedule(date(2020, 12, 31)) == [
+            ("E001", "Alice Smith", "ISO-001", Decimal("50"))
+        ]
+
+    def test_process_event_stream_rejects_unsorted_input(self):
+        events = [
+            Event(
+                event_type=EventType.VEST,
+                employee_id="E001",
+                employee_name="Alice Smith",
+                award_id="ISO-001",
+                event_date=event_date,
+                quantity=Decimal("100")
+            )
+            for event_date in [date(2020, 2, 1), date(2020, 1, 1)]
+        ]
+
+        with pytest.raises(VestingValidationError, match="Input is not sorted by date"):
+            VestingService().process_event_stream(iter(events), presorted=True)
+
+        service = VestingService()
+        service.process_event_stream(iter(events))
+        assert service.get_vesting_schedule(date(2020, 3, 1))[0][3] == Decimal("200")
+
+    def test_cli_rejects_stream_without_presorted(self, monkeypatch, capsys):
+        monkeypatch.setattr(sys, "argv", ["vesting_schedule", "events.csv", "2020-01-01", "--stream"])
+
+        with pytest.raises(SystemExit):
+            main()
+        assert "--stream requires --presorted" in capsys.readouterr().err
+
+    def test_get_employee_schedule_and_award_vesting(self):
+        service = VestingService(use_parallel=False)
+
+        events = [
+            Event(
+                event_type=EventType.VEST,
+                employee_id="E001",
+                employee_name="Alice Smith",
+                award_id="ISO-002",
+                event_date=date(2020, 1, 1),
+                quantity=Decimal("300")
+            ),
+            Event(
+                event_type=EventType.VEST,
+                employee_id="E001",
+                employee_name="Alice Smith",
+                award_id="ISO-001",
+                event_date=date(2020, 1, 1),
+                quantity=Decimal("1000")
+            ),
+            Event(
+                event_type=EventType.VEST,
+                employee_id="E002",
+                employee_name="John Small",
+                award_id="NSO-001",
+                event_date=date(2020, 2, 1),
+                quantity=Decimal("100.5")
+            )
+        ]
+
+        service.process_events(events)
+        target_date = date(2020, 3, 1)
+
+        assert service.get_employee_schedule("E001", target_date) == [
+            ("E001", "Alice Smith", "ISO-001", Decimal("1000")),
+            ("E001", "Alice Smith", "ISO-002", Decimal("300")),
+        ]
+        assert service.get_employee_schedule("E999", target_date) == []
+        assert service.get_award_vesting("NSO-001", target_date, 1) == [
+            ("E002", "John Small", "NSO-001", Decimal("100.5"))
+        ]
+        assert service.get_award_vesting("NSO-999", target_date) == []
+
+    def test_sorted_employee_ids_maintained_on_insert(self):
+        service = VestingService(use_parallel=False)
+
+        for employee_id in ["E003", "E001", "E002"]:
+            service.process_events([
+                Event(
+                    event_type=EventType.VEST,
+                    employee_id=employee_id,
+                    employee_name="Alice Smith",
+                    award_id="ISO-001",
+                    event_date=date(2020, 1, 1),
+                    quantity=Decimal("10")
+                )
+            ])
+
+        assert service.sorted_employee_ids() == ["E001", "E002", "E003"]
+        assert [row[0] for row in service.get_vesting_schedule(date(2020, 1, 1))] == ["E001", "E002", "E003"]
+
+        service.register_employee(Employee(employee_id="E000", name="Bobby Jones", awards={}))
+
+        assert service.sorted_employee_ids() == ["E000", "E001", "E002", "E003"]
+
+    def test_failed_event_is_not_remembered_as_processed(self):
+        service = VestingService(use_parallel=False)
+        cancel = Event(
+            event_type=EventType.CANCEL,
+            employee_id="E001",
+            employee_name="Alice Smith",
+            award_id="ISO-001",
+            event_date=date(2020, 2, 1),
+            quantity=Decimal("5")
+        )
+        vest = Event(
+            event_type=EventType.VEST,
+            employee_id="E001",
+            employee_name="Alice Smith",
+            award_id="ISO-001",
+            event_date=date(2020, 1, 1),
+            quantity=Decimal("100")
+        )
+
+        with pytest.raises(VestingValidationError):
+            service.process_events([cancel])
+        service.process_events([vest, cancel])
+
+        assert service.employees["E001"].awards["ISO-001"].net_vested_shares(date(2020, 12, 31)) == Decimal("95")
@@ -0,0 +1,124 @@
+from array import array
+from bisect import bisect_right
+from datetime import date
+from decimal import Decimal
+from functools import lru_cache
+from typing import List, Tuple, Sequence
+
+from models.event import Event, EventType
+from utils.decimal_utils import format_decimal
+
+SCALE_DIGITS = 6
+ORDINAL_SPAN = 1 << 22
+EVENT_KINDS = (EventType.VEST, EventType.CANCEL, EventType.PERFORMANCE)
+
+
+@lru_cache(maxsize=None)
+def _load_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def to_fixed_point(quantity: Decimal, scale_digits: int = SCALE_DIGITS) -> int:
+    scaled = quantity.scaleb(scale_digits)
+    if scaled != scaled.to_integral_value():
+        raise ValueError(f"Quantity {quantity} has more than {scale_digits} decimal places")
+    return int(scaled)
+
+
+def from_fixed_point(value: int, scale_digits: int = SCALE_DIGITS) -> Decimal:
+    return Decimal(value).scaleb(-scale_digits)
+
+
+class ColumnarEventStore:
+    def __init__(self, scale_digits: int = SCALE_DIGITS):
+        self.scale_digits = scale_digits
+        self.award_keys: List[Tuple[str, str, str]] = []
+        self._keys = array('q')
+        self._cumulative = array('q')
+        self._group_starts = array('q')
+        self._group_ends = array('q')
+
+    @classmethod
+    def from_service(cls, service, scale_digits: int = SCALE_DIGITS) -> 'ColumnarEventStore':
+        store = cls(scale_digits)
+        for employee_id in service.sorted_employee_ids():
+            employee = service.employees[employee_id]
+            for award_id in employee.sorted_award_ids():
+                award = employee.awards[award_id]
+                store.add_award(employee_id, employee.name, award_id,
+                                (award.vested_events, award.cancelled_events, award.performance_events))
+        return store
+
+    def add_award(self, employee_id: str, employee_name: str, award_id: str,
+                  events_by_kind: Tuple[Sequence[Event], Sequence[Event], Sequence[Event]]) -> int:
+        award_code = len(self.award_keys)
+        self.award_keys.append((employee_id, employee_name, award_id))
+
+        for kind_code, events in enumerate(events_by_kind):
+            group_id = award_code * len(EVENT_KINDS) + kind_code
+            self._group_starts.append(len(self._keys))
+            running = self._cumulative[-1] if self._cumulative else 0
+
+            for event in sorted(events, key=lambda e: e.event_date):
+                running += to_fixed_point(event.quantity, self.scale_digits)
+                self._keys.append(group_id * ORDINAL_SPAN + event.event_date.toordinal())
+                self._cumulative.append(running)
+
+            self._group_ends.append(len(self._keys))
+        return award_code
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _group_totals(self, target_date: date) -> List[int]:
+        group_count = len(self._group_starts)
+        if not group_count:
+            return []
+
+        target_ordinal = target_date.toordinal()
+        numpy = _load_numpy()
+        if numpy is not None:
+            keys = numpy.frombuffer(self._keys, dtype=numpy.int64)
+            cumulative = numpy.frombuffer(self._cumulative, dtype=numpy.int64)
+            starts = numpy.frombuffer(self._group_starts, dtype=numpy.int64)
+            targets = numpy.arange(group_count, dtype=numpy.int64) * ORDINAL_SPAN + target_ordinal
+            positions = numpy.searchsorted(keys, targets, side='right')
+
+            padded = numpy.concatenate((numpy.zeros(1, dtype=numpy.int64), cumulative))
+            return (padded[positions] - padded[starts]).tolist()
+
+        totals = []
+        for group_id in range(group_count):
+            start = self._group_starts[group_id]
+            end = self._group_ends[group_id]
+            position = bisect_right(self._keys, group_id * ORDINAL_SPAN + target_ordinal, start, end)
+            if position == start:
+                totals.append(0)
+                continue
+            base = self._cumulative[start - 1] if start > 0 else 0
+            totals.append(self._cumulative[position - 1] - base)
+        return totals
+
+    def net_vested_by_award(self, target_date: date) -> List[Decimal]:
+        totals = self._group_totals(target_date)
+        scale = 10 ** self.scale_digits
+        kinds = len(EVENT_KINDS)
+
+        results = []
+        for award_code in range(len(self.award_keys)):
+            vested, cancelled, performance = totals[award_code * kinds:(award_code + 1) * kinds]
+            performance = performance if performance > 0 else scale
+            net_scaled = (vested - min(vested, cancelled)) * performance
+            results.append(from_fixed_point(net_scaled, 2 * self.scale_digits))
+        return results
+
+    def get_vesting_schedule(self, target_date: date, precision: int = 0) -> List[Tuple[str, str, str, Decimal]]:
+        return [
+            (employee_id, employee_name, award_id, format_decimal(net_vested, precision))
+            for (employee_id, employee_name, award_id), net_vested
+            in zip(self.award_keys, self.net_vested_by_award(target_date))
+        ]
@@ -1,4 +1,3 @@
-import concurrent.futures
 from typing import List, Callable, TypeVar
 
 from exceptions.processing_exception import ProcessingError
@@ -6,13 +5,29 @@ from exceptions.processing_exception import ProcessingError
 T = TypeVar('T')
 R = TypeVar('R')
 
-def parallel_map(func: Callable[[T], R], items: List[T], max_workers: int = None) -> List[R]:
+EXECUTORS = ("thread", "process")
+
+
+def _create_executor(executor: str, max_workers: int = None) -> 'concurrent.futures.Executor':
+    import concurrent.futures
+
+    if executor == "thread":
+        return concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    if executor == "process":
+        return concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+    raise ProcessingError(f"Invalid executor: {executor}, expected one of {', '.join(EXECUTORS)}")
+
+
+def parallel_map(func: Callable[[T], R], items: List[T], max_workers: int = None,
+                 executor: str = "thread") -> List[R]:
     if not items:
         return []
 
+    import concurrent.futures
+
     results = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_item = {executor.submit(func, item): key for key, item in enumerate(items)}
+    with _create_executor(executor, max_workers) as pool:
+        future_to_item = {pool.submit(func, item): key for key, item in enumerate(items)}
 
         for future in concurrent.futures.as_completed(future_to_item):
             key = future_to_item[future]
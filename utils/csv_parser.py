@@ -1,23 +1,32 @@
 import csv
 import io
+import mmap
 import os
-from datetime import datetime
+import sys
+from functools import partial
 from decimal import Decimal, InvalidOperation
-from typing import List, Dict, Iterator
+from typing import List, Dict, Iterator, Optional
 
 from exceptions.parser_exceptions import CSVParserError
-from models.event import Event, EventType
+from models.event import Event, EventRecord, EventType, ParsedEvent
+from utils.date_utils import parse_date
 from utils.decimal_utils import format_decimal
 from utils.concurrency_utils import parallel_map
+from utils.instrumentation import metrics
+
+SAMPLE_BYTES = 64 * 1024
 
 
 class CSVProcessor:
-    def __init__(self, chunk_size: int = 5000, max_workers: int = 1):
+    def __init__(self, chunk_size: int = 5000, max_workers: int = 1, executor: str = "thread",
+                 compact_events: bool = True):
         self.chunk_size = chunk_size
         self.max_workers = max_workers
+        self.executor = executor
+        self.compact_events = compact_events
 
     @staticmethod
-    def _parse_row(row: List[str], line_number: int, precision: int) -> Event:
+    def _parse_row(row: List[str], line_number: int, precision: int, compact: bool = False) -> ParsedEvent:
         if len(row) != 6:
             raise CSVParserError(f"Expected 6 fields, got {len(row)}", line_number)
 
@@ -26,12 +35,12 @@ class CSVProcessor:
         except ValueError:
             raise CSVParserError(f"Invalid event type: {row[0]}", line_number)
 
-        employee_id = row[1]
-        employee_name = row[2]
-        award_id = row[3]
+        employee_id = sys.intern(row[1])
+        employee_name = sys.intern(row[2])
+        award_id = sys.intern(row[3])
 
         try:
-            event_date = datetime.strptime(row[4], "%Y-%m-%d").date()
+            event_date = parse_date(row[4])
         except ValueError:
             raise CSVParserError(
                 f"Invalid event date: '{row[4]}' expected YYYY-MM-DD", line_number
@@ -49,6 +58,13 @@ class CSVProcessor:
                 f"Invalid quantity: {row[5]}", line_number
             )
 
+        if compact:
+            if quantity <= 0:
+                raise CSVParserError(
+                    f"Quantity must be positive, got {quantity}", line_number
+                )
+            return EventRecord(event_type, employee_id, employee_name, award_id, event_date, quantity)
+
         return Event(
             event_type=event_type,
             employee_id=employee_id,
@@ -58,98 +74,137 @@ class CSVProcessor:
             quantity=quantity
         )
 
-    @staticmethod
-    def _count_file_lines(file_path: str) -> int:
-        with open(file_path, 'rb') as csv_file:
-            return sum(1 for line in csv_file)
-
-    def _process_chunk(self, chunk: List[List[str]], start_line: int, precision: int) -> List[Event]:
+    def _process_chunk(self, chunk: List[List[str]], start_line: int, precision: int) -> List[ParsedEvent]:
         events = []
         for item, row in enumerate(chunk, start=start_line):
             try:
                 if not row or all(cell.strip() == "" for cell in row):
                     continue
 
-                event = self._parse_row(row, item, precision)
+                event = self._parse_row(row, item, precision, self.compact_events)
                 events.append(event)
             except Exception as error:
                 raise CSVParserError(f"Processing of invalid chunk: {error} - {row}")
         return events
 
+    def _estimate_chunk_bytes(self, csv_map: mmap.mmap) -> int:
+        sample = csv_map[:SAMPLE_BYTES]
+        sample_lines = max(1, sample.count(b'\n'))
+        average_line_bytes = max(1, len(sample) // sample_lines)
+        return max(1, self.chunk_size * average_line_bytes)
+
     def _split_file_into_chunks(self, file_path: str) -> List[Dict]:
-        total_lines = self._count_file_lines(file_path)
-        chunk_count = max(1, total_lines // self.chunk_size)
+        if os.path.getsize(file_path) == 0:
+            return []
 
         chunks = []
-        with open(file_path, 'r', newline='') as csv_file:
-            for chunk in range(chunk_count):
-                start_pos = csv_file.tell()
-                lines = []
-
-                for item in range(self.chunk_size):
-                    line = csv_file.readline()
-                    if not line:
-                        break
-                    lines.append(line)
-
-                if lines:
-                    chunks.append({
-                        'start_pos': start_pos,
-                        'lines': lines,
-                        'start_line': chunk * self.chunk_size + 1
-                    })
+        with metrics.phase("csv.split_chunks"), open(file_path, 'rb') as csv_file, \
+                mmap.mmap(csv_file.fileno(), 0, access=mmap.ACCESS_READ) as csv_map:
+            file_size = len(csv_map)
+            chunk_bytes = self._estimate_chunk_bytes(csv_map)
+
+            start_pos = 0
+            while start_pos < file_size:
+                end_pos = min(file_size, start_pos + chunk_bytes)
+                if end_pos < file_size:
+                    newline_pos = csv_map.find(b'\n', end_pos - 1)
+                    end_pos = file_size if newline_pos == -1 else newline_pos + 1
+
+                chunks.append({
+                    'file_path': file_path,
+                    'start_pos': start_pos,
+                    'end_pos': end_pos
+                })
+                start_pos = end_pos
         return chunks
 
-    def _process_file_chunk(self, chunk: Dict, precision: int) -> List[Event]:
-        reader = csv.reader(io.StringIO(''.join(chunk['lines'])))
-        rows = list(reader)
-        return self._process_chunk(rows, chunk['start_line'], precision)
+    @staticmethod
+    def _line_number_at(file_path: str, position: int) -> int:
+        with open(file_path, 'rb') as csv_file, \
+                mmap.mmap(csv_file.fileno(), 0, access=mmap.ACCESS_READ) as csv_map:
+            return csv_map[:position].count(b'\n') + 1
+
+    def _process_file_chunk(self, chunk: Dict, precision: int) -> List[ParsedEvent]:
+        with open(chunk['file_path'], 'rb') as csv_file, \
+                mmap.mmap(csv_file.fileno(), 0, access=mmap.ACCESS_READ) as csv_map:
+            data = csv_map[chunk['start_pos']:chunk['end_pos']].decode('utf-8')
+
+        with metrics.phase("csv.parse_chunk"):
+            rows = list(csv.reader(io.StringIO(data, newline='')))
+            try:
+                events = self._process_chunk(rows, 1, precision)
+            except CSVParserError:
+                # Line numbers are only needed on failure, so the chunk is re-parsed with absolute ones.
+                self._process_chunk(rows, self._line_number_at(chunk['file_path'], chunk['start_pos']), precision)
+                raise
+
+        if metrics.enabled:
+            metrics.count("csv.rows_parsed", len(events))
+        return events
 
-    def parallel_process_csv(self, file_path: str, precision: int = 0) -> List[Event]:
+    def parallel_process_csv(self, file_path: str, precision: int = 0) -> List[ParsedEvent]:
         if not os.path.exists(file_path):
             raise CSVParserError(f"File not found: {file_path}")
 
         try:
             chunks = self._split_file_into_chunks(file_path)
             all_events = parallel_map(
-                lambda chunk: self._process_file_chunk(chunk, precision),
+                partial(self._process_file_chunk, precision=precision),
                 chunks,
-                max_workers=self.max_workers if self.max_workers and self.max_workers > 0 else None
+                max_workers=self.max_workers if self.max_workers and self.max_workers > 0 else None,
+                executor=self.executor
             )
             return [event for chunk_events in all_events for event in chunk_events]
 
         except Exception as error:
             raise CSVParserError(f"Error during CSV processing: {error}")
 
-    def stream_parse_csv(self, file_path: str, precision: int = 0) -> Iterator[Event]:
+    @staticmethod
+    def _read_lines(csv_file, start_offset: int, end_offset: Optional[int]) -> Iterator[str]:
+        csv_file.seek(start_offset)
+        position = start_offset
+        for line in csv_file:
+            if end_offset is not None and position >= end_offset:
+                break
+            position += len(line)
+            yield line.decode('utf-8')
+
+    def stream_parse_csv(self, file_path: str, precision: int = 0, start_offset: int = 0,
+                         end_offset: Optional[int] = None) -> Iterator[ParsedEvent]:
         if not os.path.exists(file_path):
             raise CSVParserError(f"File not found: {file_path}")
         try:
-            with open(file_path, 'r', newline='') as csvfile:
-                reader = csv.reader(csvfile, delimiter=',')
+            with open(file_path, 'rb') as csvfile:
+                reader = csv.reader(self._read_lines(csvfile, start_offset, end_offset), delimiter=',')
                 batch = []
 
                 for line_number, row in enumerate(reader, 1):
                     if not row or all(cell.strip() == "" for cell in row):
                         continue
                     try:
-                        event = self._parse_row(row, line_number, precision)
+                        event = self._parse_row(row, line_number, precision, self.compact_events)
                         batch.append(event)
                     except Exception as error:
                         raise CSVParserError(f"Unexpected error parsing row: {error}")
 
                     if len(batch) >= self.chunk_size:
+                        if metrics.enabled:
+                            metrics.count("csv.rows_parsed", len(batch))
                         yield from batch
                         batch = []
 
                 if batch:
+                    if metrics.enabled:
+                        metrics.count("csv.rows_parsed", len(batch))
                     yield from batch
         except Exception as error:
             raise CSVParserError(f"Unexpected error: {error}")
 
 def parse_csv(csv_file: str, precision: int = 0, use_parallel: bool = True,
-              max_workers: int = None, chunk_size: int = 5000) -> List[Event]:
-    processor = CSVProcessor(chunk_size=chunk_size, max_workers=max_workers)
+              max_workers: int = None, chunk_size: int = 5000, executor: str = "thread",
+              compact_events: bool = True) -> List[ParsedEvent]:
+    processor = CSVProcessor(chunk_size=chunk_size, max_workers=max_workers, executor=executor,
+                             compact_events=compact_events)
     try:
         if use_parallel:
             return processor.parallel_process_csv(csv_file, precision)
@@ -159,3 +214,16 @@ def parse_csv(csv_file: str, precision: int = 0, use_parallel: bool = True,
         raise
     except Exception as error:
         raise CSVParserError(f"Unexpected error: {error}")
+
+
+def parse_csv_text(text: str, precision: int = 0, compact_events: bool = True) -> List[ParsedEvent]:
+    processor = CSVProcessor(compact_events=compact_events)
+    rows = list(csv.reader(io.StringIO(text, newline='')))
+    return processor._process_chunk(rows, 1, precision)
+
+
+def stream_csv(csv_file: str, precision: int = 0, chunk_size: int = 5000,
+               compact_events: bool = True, start_offset: int = 0,
+               end_offset: Optional[int] = None) -> Iterator[ParsedEvent]:
+    processor = CSVProcessor(chunk_size=chunk_size, compact_events=compact_events)
+    return processor.stream_parse_csv(csv_file, precision, start_offset, end_offset)
@@ -0,0 +1,47 @@
+import calendar
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List
+
+DATE_STEPS = ("day", "week", "month", "quarter", "year")
+DATE_CACHE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(value: str) -> date:
+    if len(value) == 10 and value[4] == "-" and value[7] == "-" and value[:4].isdigit():
+        return date.fromisoformat(value)
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def add_months(start: date, months: int) -> date:
+    month_index = start.month - 1 + months
+    year = start.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(start.day, calendar.monthrange(year, month)[1])
+    return date(year, month, day)
+
+
+def date_range(start: date, end: date, step: str = "month") -> List[date]:
+    if step not in DATE_STEPS:
+        raise ValueError(f"Invalid date step: {step}, expected one of {', '.join(DATE_STEPS)}")
+    if end < start:
+        raise ValueError(f"End date {end} is before start date {start}")
+
+    dates = []
+    count = 0
+    current = start
+    while current <= end:
+        dates.append(current)
+        count += 1
+        if step == "day":
+            current = start + timedelta(days=count)
+        elif step == "week":
+            current = start + timedelta(weeks=count)
+        elif step == "month":
+            current = add_months(start, count)
+        elif step == "quarter":
+            current = add_months(start, count * 3)
+        else:
+            current = add_months(start, count * 12)
+    return dates
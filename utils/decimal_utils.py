@@ -1,9 +1,16 @@
 import decimal
 from decimal import Decimal, getcontext
+from functools import lru_cache
 from typing import List
 
 getcontext().prec = 28
 
+
+@lru_cache(maxsize=None)
+def _quantizer(precision: int) -> Decimal:
+    return Decimal(1).scaleb(-precision)
+
+
 def format_decimal(value: Decimal, precision: int = 0, rounding: str = decimal.ROUND_DOWN) -> Decimal:
     if not isinstance(value, Decimal):
         try:
@@ -12,10 +19,9 @@ def format_decimal(value: Decimal, precision: int = 0, rounding: str = decimal.R
             raise ValueError(f"Cannot format non-decimal value: {value}")
 
     if precision <= 0:
-        return value.to_integral_exact(rounding=getattr(decimal, rounding))
+        return value.to_integral_exact(rounding=rounding)
     else:
-        quantizer = Decimal('0.' + '0' * precision)
-        return value.quantize(quantizer, rounding=getattr(decimal, rounding))
+        return value.quantize(_quantizer(precision), rounding=rounding)
 
 
 def decimal_sum(values: List, default: Decimal = Decimal('0')) -> Decimal:
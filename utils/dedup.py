@@ -0,0 +1,38 @@
+from hashlib import blake2b
+from typing import Dict, Set, Tuple
+
+from models.event import ParsedEvent
+
+AwardKey = Tuple[str, str]
+
+
+def event_key(event: ParsedEvent) -> int:
+    canonical = "\x1f".join((
+        str(event.event_type), event.employee_id, event.award_id,
+        event.event_date.isoformat(), str(event.quantity.normalize())
+    ))
+    return int.from_bytes(blake2b(canonical.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class EventDeduplicator:
+    def __init__(self):
+        self.keys: Dict[AwardKey, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(award_keys) for award_keys in self.keys.values())
+
+    def add_key(self, award_key: AwardKey, key: int) -> None:
+        self.keys.setdefault(award_key, set()).add(key)
+
+    def contains_key(self, award_key: AwardKey, key: int) -> bool:
+        award_keys = self.keys.get(award_key)
+        return award_keys is not None and key in award_keys
+
+    def contains(self, event: ParsedEvent) -> bool:
+        return self.contains_key((event.employee_id, event.award_id), event_key(event))
+
+    def add(self, event: ParsedEvent) -> None:
+        self.add_key((event.employee_id, event.award_id), event_key(event))
+
+    def release(self, award_key: AwardKey) -> None:
+        self.keys.pop(award_key, None)
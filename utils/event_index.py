@@ -0,0 +1,89 @@
+from bisect import bisect_right
+from datetime import date
+from decimal import Decimal
+from typing import List, Iterator, Optional
+
+from models.event import Event
+
+
+class EventIndex:
+    def __init__(self, events: Optional[List[Event]] = None):
+        self._events: List[Event] = events if events is not None else []
+        self._events.sort(key=lambda event: event.event_date)
+        self._dates: List[date] = [event.event_date for event in self._events]
+        self._totals: List[Decimal] = []
+        self._shifts = 0
+        self._rebuild_totals(0)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __iter__(self) -> Iterator[Event]:
+        return iter(self._events)
+
+    def __getitem__(self, position: int) -> Event:
+        return self._events[position]
+
+    @property
+    def events(self) -> List[Event]:
+        return self._events
+
+    @property
+    def dates(self) -> List[date]:
+        return self._dates
+
+    @property
+    def totals(self) -> List[Decimal]:
+        return self._totals
+
+    @property
+    def shifts(self) -> int:
+        # Number of adds that landed before the tail; while unchanged, earlier positions are stable.
+        return self._shifts
+
+    def _rebuild_totals(self, start: int) -> None:
+        del self._totals[start:]
+        running = self._totals[start - 1] if start > 0 else Decimal('0')
+        for event in self._events[start:]:
+            running = running + event.quantity
+            self._totals.append(running)
+
+    def add(self, event: Event) -> int:
+        position = bisect_right(self._dates, event.event_date)
+        if position == len(self._events):
+            self._events.append(event)
+            self._dates.append(event.event_date)
+            previous = self._totals[-1] if self._totals else Decimal('0')
+            self._totals.append(previous + event.quantity)
+        else:
+            self._events.insert(position, event)
+            self._dates.insert(position, event.event_date)
+            self._rebuild_totals(position)
+            self._shifts += 1
+        return position
+
+    def extend_sorted(self, events: List[Event], totals: List[Decimal]) -> None:
+        if len(events) != len(totals):
+            raise ValueError("Events and totals must have the same length")
+        if self._dates and events and events[0].event_date < self._dates[-1]:
+            raise ValueError("Events must not precede the existing index")
+        self._events.extend(events)
+        self._dates.extend(event.event_date for event in events)
+        self._totals.extend(totals)
+
+    def count_at(self, target_date: date) -> int:
+        return bisect_right(self._dates, target_date)
+
+    def total_at(self, target_date: date) -> Decimal:
+        position = bisect_right(self._dates, target_date)
+        if position == 0:
+            return Decimal('0')
+        return self._totals[position - 1]
+
+    def totals_at(self, target_dates: List[date]) -> List[Decimal]:
+        results = []
+        position = 0
+        for target_date in target_dates:
+            position = bisect_right(self._dates, target_date, position)
+            results.append(self._totals[position - 1] if position > 0 else Decimal('0'))
+        return results
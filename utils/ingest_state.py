@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+from typing import Dict
+
+from exceptions.parser_exceptions import CSVParserError
+
+CHECKSUM_WINDOW = 64 * 1024
+
+
+def complete_lines_end(file_path: str) -> int:
+    with open(file_path, 'rb') as csv_file:
+        csv_file.seek(0, os.SEEK_END)
+        end = csv_file.tell()
+        position = end
+        while position > 0:
+            block_start = max(0, position - CHECKSUM_WINDOW)
+            csv_file.seek(block_start)
+            block = csv_file.read(position - block_start)
+            newline = block.rfind(b'\n')
+            if newline != -1:
+                return block_start + newline + 1
+            position = block_start
+    return 0
+
+
+def consumed_checksum(file_path: str, offset: int) -> str:
+    start = max(0, offset - CHECKSUM_WINDOW)
+    with open(file_path, 'rb') as csv_file:
+        csv_file.seek(start)
+        data = csv_file.read(offset - start)
+    if len(data) != offset - start:
+        raise CSVParserError(f"File is shorter than its recorded ingest offset: {file_path}")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class IngestState:
+    def __init__(self, file_path: str, marks: Dict[str, Dict] = None):
+        self.file_path = file_path
+        self.marks: Dict[str, Dict] = marks if marks is not None else {}
+
+    @classmethod
+    def load(cls, file_path: str) -> 'IngestState':
+        if not os.path.exists(file_path):
+            return cls(file_path)
+        try:
+            with open(file_path, 'r') as state_file:
+                return cls(file_path, json.load(state_file)["files"])
+        except (ValueError, KeyError) as error:
+            raise CSVParserError(f"Invalid ingest state file {file_path}: {error}")
+
+    def save(self) -> None:
+        temporary_path = f"{self.file_path}.tmp"
+        with open(temporary_path, 'w') as state_file:
+            json.dump({"files": self.marks}, state_file, indent=2, sort_keys=True)
+        os.replace(temporary_path, self.file_path)
+
+    def resume_offset(self, csv_file: str) -> int:
+        mark = self.marks.get(os.path.abspath(csv_file))
+        if mark is None:
+            return 0
+
+        offset = mark["offset"]
+        if os.path.getsize(csv_file) < offset or consumed_checksum(csv_file, offset) != mark["checksum"]:
+            raise CSVParserError(f"File changed since it was last ingested: {csv_file}")
+        return offset
+
+    def record(self, csv_file: str, offset: int) -> None:
+        self.marks[os.path.abspath(csv_file)] = {
+            "offset": offset,
+            "checksum": consumed_checksum(csv_file, offset)
+        }
@@ -0,0 +1,146 @@
+import sys
+import time
+from threading import Lock
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+PhaseHook = Callable[[str, float], None]
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("_metrics", "_name", "_started")
+
+    def __init__(self, metrics: 'Instrumentation', name: str):
+        self._metrics = metrics
+        self._name = name
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._metrics.add_time(self._name, time.perf_counter() - self._started)
+        return False
+
+
+class _TimedLock:
+    __slots__ = ("_metrics", "_lock", "_name")
+
+    def __init__(self, metrics: 'Instrumentation', lock, name: str):
+        self._metrics = metrics
+        self._lock = lock
+        self._name = name
+
+    def __enter__(self):
+        started = time.perf_counter()
+        self._lock.acquire()
+        self._metrics.add_lock_wait(self._name, time.perf_counter() - started)
+        return self._lock
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._lock.release()
+        return False
+
+
+class Instrumentation:
+    def __init__(self):
+        self.enabled = False
+        self.timers: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+        self.lock_waits: Dict[str, float] = {}
+        self._hooks: List[PhaseHook] = []
+        self._lock = Lock()
+        self._started: Optional[float] = None
+
+    def enable(self) -> None:
+        self.reset()
+        self.enabled = True
+        self._started = time.perf_counter()
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self.timers.clear()
+            self.calls.clear()
+            self.counters.clear()
+            self.lock_waits.clear()
+        self._started = time.perf_counter() if self.enabled else None
+
+    def add_hook(self, hook: PhaseHook) -> None:
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: PhaseHook) -> None:
+        self._hooks.remove(hook)
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def timed_lock(self, lock, name: str):
+        if not self.enabled:
+            return lock
+        return _TimedLock(self, lock, name)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.timers[name] = self.timers.get(name, 0.0) + seconds
+            self.calls[name] = self.calls.get(name, 0) + 1
+        for hook in self._hooks:
+            hook(name, seconds)
+
+    def add_lock_wait(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.lock_waits[name] = self.lock_waits.get(name, 0.0) + seconds
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @staticmethod
+    def peak_memory() -> Dict[str, Optional[int]]:
+        import tracemalloc
+
+        peak = {"rss_bytes": None}
+        if resource is not None:
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            peak["rss_bytes"] = max_rss if sys.platform == "darwin" else max_rss * 1024
+        if tracemalloc.is_tracing():
+            peak["traced_bytes"] = tracemalloc.get_traced_memory()[1]
+        return peak
+
+    def report(self) -> Dict:
+        with self._lock:
+            return {
+                "wall_seconds": round(time.perf_counter() - self._started, 6) if self._started else None,
+                "phases": {
+                    name: {"seconds": round(seconds, 6), "calls": self.calls[name]}
+                    for name, seconds in sorted(self.timers.items())
+                },
+                "counters": dict(sorted(self.counters.items())),
+                "lock_wait_seconds": {name: round(seconds, 6) for name, seconds in sorted(self.lock_waits.items())},
+                "peak_memory": self.peak_memory(),
+            }
+
+
+metrics = Instrumentation()
@@ -0,0 +1,82 @@
+import gzip
+import io
+import sys
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+
+BLOCK_ROWS = 8192
+FILE_BUFFER_BYTES = 1024 * 1024
+
+ScheduleRow = Tuple[str, str, str, Decimal]
+
+
+def format_net_vested(net_vested: Decimal, precision: int) -> str:
+    if not net_vested:
+        net_vested = Decimal(0)
+    if precision == 0:
+        return str(int(net_vested))
+    return f"{net_vested:.{precision}f}"
+
+
+class ScheduleWriter:
+    def __init__(self, stream: IO[str], precision: int = 0, block_rows: int = BLOCK_ROWS):
+        if block_rows <= 0:
+            raise ValueError(f"Block size must be positive, got {block_rows}")
+        self.stream = stream
+        self.precision = precision
+        self.block_rows = block_rows
+        self.rows_written = 0
+        self._lines: List[str] = []
+
+    def write_rows(self, schedule: Iterable[ScheduleRow], schedule_date: Optional[date] = None) -> None:
+        prefix = f"{schedule_date.isoformat()}," if schedule_date is not None else ""
+        precision = self.precision
+        lines = self._lines
+
+        for employee_id, employee_name, award_id, net_vested in schedule:
+            lines.append(f"{prefix}{employee_id},{employee_name},{award_id},"
+                         f"{format_net_vested(net_vested, precision)}")
+            if len(lines) >= self.block_rows:
+                self.flush()
+
+    def flush(self) -> None:
+        if self._lines:
+            self.stream.write("\n".join(self._lines) + "\n")
+            self.rows_written += len(self._lines)
+            self._lines.clear()
+
+
+@contextmanager
+def open_output(file_path: Optional[str] = None, compress: bool = False) -> Iterator[IO[str]]:
+    if file_path is None and not compress:
+        yield sys.stdout
+        sys.stdout.flush()
+        return
+
+    compress = compress or (file_path is not None and file_path.endswith(".gz"))
+    if file_path is None:
+        binary = sys.stdout.buffer
+    else:
+        binary = open(file_path, "wb", buffering=FILE_BUFFER_BYTES)
+
+    try:
+        if compress:
+            binary_stream = gzip.GzipFile(fileobj=binary, mode="wb", compresslevel=6)
+        else:
+            binary_stream = binary
+        stream = io.TextIOWrapper(binary_stream, encoding="utf-8", newline="\n",
+                                  write_through=False)
+        try:
+            yield stream
+        finally:
+            stream.flush()
+            stream.detach()
+            if compress:
+                binary_stream.close()
+    finally:
+        if file_path is None:
+            binary.flush()
+        else:
+            binary.close()
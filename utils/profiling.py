@@ -0,0 +1,101 @@
+import cProfile
+import pstats
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from utils.instrumentation import metrics
+
+PROFILE_MODES = ("cpu", "mem")
+DEFAULT_CPU_PROFILE = "vesting_schedule.prof"
+TRACEMALLOC_FRAMES = 5
+
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>")
+
+
+class CPUProfiler:
+    def __init__(self, output_path: Optional[str] = None):
+        self.output_path = output_path or DEFAULT_CPU_PROFILE
+        self._profiler = cProfile.Profile()
+
+    def start(self) -> None:
+        self._profiler.enable()
+
+    def stop(self) -> pstats.Stats:
+        self._profiler.disable()
+
+        stats = pstats.Stats(self._profiler)
+        stats.dump_stats(self.output_path)
+        print(f"CPU profile written to {self.output_path} (all threads profiled)", file=sys.stderr)
+        return stats
+
+
+class MemoryProfiler:
+    def __init__(self, output_path: Optional[str] = None, top: int = 10):
+        self.output_path = output_path
+        self.top = top
+        self.phases: List[Tuple[str, List[tracemalloc.StatisticDiff]]] = []
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._enabled_metrics = False
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, file_name) for file_name in _IGNORED_FILES]
+        )
+
+    def _on_phase(self, name: str, seconds: float) -> None:
+        if not name.startswith("cli."):
+            return
+        snapshot = self._snapshot()
+        self.phases.append((name, snapshot.compare_to(self._previous, "lineno")[:self.top]))
+        self._previous = snapshot
+
+    def start(self) -> None:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        if not metrics.enabled:
+            metrics.enable()
+            self._enabled_metrics = True
+        metrics.add_hook(self._on_phase)
+        self._previous = self._snapshot()
+
+    def report(self) -> str:
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"Traced memory: current={current / 1024:.1f} KiB peak={peak / 1024:.1f} KiB"]
+        for name, differences in self.phases:
+            lines.append("")
+            lines.append(f"Top {len(differences)} allocation sites during {name}:")
+            lines.extend(f"  {difference}" for difference in differences)
+        return "\n".join(lines) + "\n"
+
+    def stop(self) -> str:
+        metrics.remove_hook(self._on_phase)
+        if self._enabled_metrics:
+            metrics.disable()
+        report = self.report()
+        tracemalloc.stop()
+
+        if self.output_path is None:
+            sys.stderr.write(report)
+        else:
+            with open(self.output_path, "w") as report_file:
+                report_file.write(report)
+            print(f"Memory profile written to {self.output_path}", file=sys.stderr)
+        return report
+
+
+@contextmanager
+def profiling(mode: Optional[str], output_path: Optional[str] = None, top: int = 10) -> Iterator:
+    if mode is None:
+        yield None
+        return
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Invalid profile mode: {mode}, expected one of {', '.join(PROFILE_MODES)}")
+
+    profiler = CPUProfiler(output_path) if mode == "cpu" else MemoryProfiler(output_path, top)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
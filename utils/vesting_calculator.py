@@ -1,23 +1,49 @@
+from bisect import bisect_right
+from array import array
 from datetime import date
 from decimal import Decimal
-from typing import List, Protocol
+from typing import Callable, Dict, Iterable, Sequence, Protocol, Tuple, Type, TypeVar
+from weakref import WeakKeyDictionary
 
 from models.event import Event
 from utils.decimal_utils import decimal_sum
+from utils.event_index import EventIndex
+from utils.columnar_store import SCALE_DIGITS, to_fixed_point, from_fixed_point
+
+C = TypeVar('C')
+
+DEFAULT_ENGINE = "indexed"
+CALCULATORS: Dict[str, type] = {}
 
 
 class VestingCalculator(Protocol):
-    def calculate_vested_shares(self, events: List[Event], target_date: date) -> Decimal:
+    def calculate_vested_shares(self, events: Sequence[Event], target_date: date) -> Decimal:
         ...
 
-    def calculate_cancelled_shares(self, events: List[Event], target_date: date) -> Decimal:
+    def calculate_cancelled_shares(self, events: Sequence[Event], target_date: date) -> Decimal:
         ...
 
-    def calculate_performance_bonus(self, events: List[Event], target_date: date) -> Decimal:
+    def calculate_performance_bonus(self, events: Sequence[Event], target_date: date) -> Decimal:
         ...
 
+
+def register_calculator(engine: str) -> Callable[[Type[C]], Type[C]]:
+    def inner(calculator_class: Type[C]) -> Type[C]:
+        CALCULATORS[engine] = calculator_class
+        return calculator_class
+    return inner
+
+
+def create_calculator(engine: str = DEFAULT_ENGINE) -> VestingCalculator:
+    if engine not in CALCULATORS:
+        raise ValueError(f"No calculator registered for engine: {engine}, "
+                         f"expected one of {', '.join(CALCULATORS)}")
+    return CALCULATORS[engine]()
+
+
+@register_calculator("default")
 class DefaultVestingCalculator:
-    def calculate_vested_shares(self, events: List[Event], target_date: date) -> Decimal:
+    def calculate_vested_shares(self, events: Sequence[Event], target_date: date) -> Decimal:
         quantities = [
             event.quantity
             for event in sorted(events, key=lambda event: event.event_date)
@@ -26,7 +52,7 @@ class DefaultVestingCalculator:
 
         return decimal_sum(quantities)
 
-    def calculate_cancelled_shares(self, events: List[Event], target_date: date) -> Decimal:
+    def calculate_cancelled_shares(self, events: Sequence[Event], target_date: date) -> Decimal:
         quantities = [
             event.quantity
             for event in sorted(events, key=lambda e: e.event_date)
@@ -34,7 +60,7 @@ class DefaultVestingCalculator:
         ]
         return decimal_sum(quantities)
 
-    def calculate_performance_bonus(self, events: List[Event], target_date: date) -> Decimal:
+    def calculate_performance_bonus(self, events: Sequence[Event], target_date: date) -> Decimal:
         total_performance_events = [
             event.quantity
             for event in sorted(events, key=lambda e: e.event_date)
@@ -44,3 +70,82 @@ class DefaultVestingCalculator:
         if result > 0:
             return Decimal(result)
         return Decimal(1)
+
+
+@register_calculator("indexed")
+class IndexedVestingCalculator:
+    @staticmethod
+    def _index(events: Sequence[Event]) -> EventIndex:
+        if isinstance(events, EventIndex):
+            return events
+        return EventIndex(list(events))
+
+    def calculate_vested_shares(self, events: Sequence[Event], target_date: date) -> Decimal:
+        return self._index(events).total_at(target_date)
+
+    def calculate_cancelled_shares(self, events: Sequence[Event], target_date: date) -> Decimal:
+        return self._index(events).total_at(target_date)
+
+    def calculate_performance_bonus(self, events: Sequence[Event], target_date: date) -> Decimal:
+        result = self._index(events).total_at(target_date)
+        if result > 0:
+            return result
+        return Decimal(1)
+
+
+@register_calculator("columnar")
+class ColumnarVestingCalculator:
+    def __init__(self, scale_digits: int = SCALE_DIGITS):
+        self.scale_digits = scale_digits
+        self._columns: WeakKeyDictionary = WeakKeyDictionary()
+
+    def __getstate__(self):
+        return {"scale_digits": self.scale_digits}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _append_columns(self, ordinals: array, cumulative: array, sorted_events: Iterable[Event]) -> None:
+        running = cumulative[-1] if cumulative else 0
+        for event in sorted_events:
+            running += to_fixed_point(event.quantity, self.scale_digits)
+            ordinals.append(event.event_date.toordinal())
+            cumulative.append(running)
+
+    def _build_columns(self, events: Sequence[Event]) -> Tuple[array, array]:
+        ordinals = array('q')
+        cumulative = array('q')
+        self._append_columns(ordinals, cumulative, sorted(events, key=lambda e: e.event_date))
+        return ordinals, cumulative
+
+    def _get_columns(self, events: Sequence[Event]) -> Tuple[array, array]:
+        if not isinstance(events, EventIndex):
+            return self._build_columns(events)
+
+        cached = self._columns.get(events)
+        if cached is None or cached[2] != events.shifts:
+            ordinals, cumulative = self._build_columns(events)
+            self._columns[events] = (ordinals, cumulative, events.shifts)
+            return ordinals, cumulative
+
+        ordinals, cumulative, _ = cached
+        if len(ordinals) < len(events):
+            self._append_columns(ordinals, cumulative, events.events[len(ordinals):])
+        return ordinals, cumulative
+
+    def _total(self, events: Sequence[Event], target_date: date) -> int:
+        ordinals, cumulative = self._get_columns(events)
+        position = bisect_right(ordinals, target_date.toordinal())
+        return cumulative[position - 1] if position > 0 else 0
+
+    def calculate_vested_shares(self, events: Sequence[Event], target_date: date) -> Decimal:
+        return from_fixed_point(self._total(events, target_date), self.scale_digits)
+
+    def calculate_cancelled_shares(self, events: Sequence[Event], target_date: date) -> Decimal:
+        return from_fixed_point(self._total(events, target_date), self.scale_digits)
+
+    def calculate_performance_bonus(self, events: Sequence[Event], target_date: date) -> Decimal:
+        total = self._total(events, target_date)
+        if total > 0:
+            return from_fixed_point(total, self.scale_digits)
+        return Decimal(1)
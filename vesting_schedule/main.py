@@ -1,14 +1,23 @@
+import os
 import sys
 import argparse
-from datetime import datetime
+from datetime import date, datetime
+from typing import List, Optional
 
-from exceptions.parser_exceptions import CSVParserError
-from exceptions.vesting_exception import VestingValidationError
-from utils.csv_parser import parse_csv
-from services.vesting_service import VestingService
+from utils.concurrency_utils import EXECUTORS
+from utils.date_utils import DATE_STEPS, date_range
+from utils.instrumentation import metrics
+
+PROFILE_MODES = ("cpu", "mem")
+ENGINES = ("default", "indexed", "columnar")
 
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        from vesting_schedule.server import serve_main
+        serve_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(description='Vesting schedule to show vested shares at a given time')
     parser.add_argument('file', help='CSV file containing vesting events')
     parser.add_argument('date', help='Target date in YYYY-MM-DD format')
@@ -19,6 +28,37 @@ def main():
                         help='Number of worker threads/processes (default: auto)')
     parser.add_argument('--chunk-size', type=int, default=5000,
                         help='Number of rows to process in each chunk (default: 5000)')
+    parser.add_argument('--executor', choices=EXECUTORS, default='thread',
+                        help='Worker pool used with --parallel (default: thread)')
+    parser.add_argument('--engine', choices=ENGINES, default='indexed',
+                        help='Calculator used for vesting totals (default: indexed)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Feed events into the service in batches of --chunk-size instead of loading them all '
+                             '(requires --presorted)')
+    parser.add_argument('--presorted', action='store_true',
+                        help='Input is already sorted by date, so ingestion skips the global sort')
+    parser.add_argument('--snapshot-in', default=None,
+                        help='Start from a saved snapshot and apply only events it has not seen')
+    parser.add_argument('--snapshot-out', default=None,
+                        help='Save the processed state to a snapshot file')
+    parser.add_argument('--ingest-state', default=None,
+                        help='JSON file recording how far each CSV was ingested; with --snapshot-in only '
+                             'appended rows are read (requires --snapshot-out)')
+    parser.add_argument('--end-date', default=None,
+                        help='Produce a schedule for every step from date to this YYYY-MM-DD date')
+    parser.add_argument('--step', choices=DATE_STEPS, default='month',
+                        help='Interval between target dates when --end-date is given (default: month)')
+    parser.add_argument('--output', default=None,
+                        help='Write the schedule to this file instead of stdout (gzip-compressed if it ends in .gz)')
+    parser.add_argument('--gzip', action='store_true', help='Gzip-compress the schedule output')
+    parser.add_argument('--stats', action='store_true',
+                        help='Print per-phase timings, counters and peak memory as JSON to stderr')
+    parser.add_argument('--profile', choices=PROFILE_MODES, default=None,
+                        help='Profile the run: cpu writes a pstats file, mem reports top allocation sites per phase')
+    parser.add_argument('--profile-output', default=None,
+                        help='Where to write the profile (default: vesting_schedule.prof for cpu, stderr for mem)')
+    parser.add_argument('--profile-top', type=int, default=10,
+                        help='Number of allocation sites to report per phase with --profile mem (default: 10)')
 
     args = parser.parse_args()
 
@@ -26,47 +66,129 @@ def main():
         print(f"Error: Precision must be between 0 and 6, got {args.precision}", file=sys.stderr)
         sys.exit(1)
 
+    if args.stream and not args.presorted:
+        print("Error: --stream requires --presorted; unsorted input must be loaded whole to be sorted",
+              file=sys.stderr)
+        sys.exit(1)
+
+    if args.ingest_state is not None and args.snapshot_out is None:
+        print("Error: --ingest-state requires --snapshot-out", file=sys.stderr)
+        sys.exit(1)
+
     try:
+        target_date = datetime.strptime(args.date, "%Y-%m-%d").date()
+    except ValueError:
+        print(f"Error: Invalid date format '{args.date}'. Use YYYY-MM-DD.", file=sys.stderr)
+        sys.exit(1)
+
+    target_dates = None
+    if args.end_date is not None:
         try:
-            target_date = datetime.strptime(args.date, "%Y-%m-%d").date()
+            end_date = datetime.strptime(args.end_date, "%Y-%m-%d").date()
         except ValueError:
-            print(f"Error: Invalid date format '{args.date}'. Use YYYY-MM-DD.", file=sys.stderr)
+            print(f"Error: Invalid date format '{args.end_date}'. Use YYYY-MM-DD.", file=sys.stderr)
+            sys.exit(1)
+        try:
+            target_dates = date_range(target_date, end_date, args.step)
+        except ValueError as error:
+            print(f"Error: {error}", file=sys.stderr)
             sys.exit(1)
 
-        events = parse_csv(
-            args.file,
-            args.precision,
-            use_parallel=args.parallel,
-            max_workers=args.workers,
-            chunk_size=args.chunk_size
-        )
+    if args.stats:
+        metrics.enable()
 
-        service = VestingService(use_parallel=args.parallel, max_workers=args.workers)
-        service.process_events(events)
+    if args.profile is None:
+        run(args, target_date, target_dates)
+        return
 
-        schedule = service.get_vesting_schedule(target_date, args.precision)
+    from utils.profiling import profiling
+    with profiling(args.profile, args.profile_output, args.profile_top):
+        run(args, target_date, target_dates)
 
-        for employee_id, employee_name, award_id, net_vested in schedule:
-            if args.precision == 0:
-                net_vested_str = str(int(net_vested))
+
+def run(args: argparse.Namespace, target_date: date, target_dates: Optional[List[date]] = None) -> None:
+    from exceptions.parser_exceptions import CSVParserError
+    from exceptions.snapshot_exception import SnapshotError
+    from exceptions.vesting_exception import VestingValidationError
+    from utils.csv_parser import parse_csv, stream_csv
+    from utils.ingest_state import IngestState, complete_lines_end
+    from utils.output_writer import ScheduleWriter, open_output
+    from services.snapshot import load_snapshot, save_snapshot
+    from services.vesting_service import VestingService
+
+    try:
+        service_options = dict(use_parallel=args.parallel, max_workers=args.workers, executor=args.executor,
+                               engine=args.engine)
+        if args.snapshot_in is not None:
+            with metrics.phase("cli.load_snapshot"):
+                service = load_snapshot(args.snapshot_in, **service_options)
+        else:
+            service = VestingService(**service_options)
+
+        ingest_state = None
+        with metrics.phase("cli.ingest"):
+            if args.ingest_state is not None:
+                ingest_state = IngestState.load(args.ingest_state)
+                start_offset = ingest_state.resume_offset(args.file) if args.snapshot_in is not None else 0
+                # A row without its newline may still be mid-write, so it is left for the next run.
+                end_offset = complete_lines_end(args.file)
+                if end_offset < os.path.getsize(args.file):
+                    print(f"Warning: last row of {args.file} has no trailing newline; it is deferred "
+                          f"to the next --ingest-state run", file=sys.stderr)
+                events = stream_csv(args.file, args.precision, chunk_size=args.chunk_size,
+                                    start_offset=start_offset, end_offset=end_offset)
+                service.process_event_stream(events, batch_size=args.chunk_size, presorted=args.presorted)
+            elif args.stream:
+                events = stream_csv(args.file, args.precision, chunk_size=args.chunk_size)
+                service.process_event_stream(events, batch_size=args.chunk_size, presorted=args.presorted)
             else:
-                format_str = f"{{:.{args.precision}f}}"
-                net_vested_str = format_str.format(float(net_vested))
-                if float(net_vested) == 0:
-                    net_vested_str = format_str.format(0)
+                events = parse_csv(
+                    args.file,
+                    args.precision,
+                    use_parallel=args.parallel,
+                    max_workers=args.workers,
+                    chunk_size=args.chunk_size,
+                    executor=args.executor
+                )
+                service.process_events(events)
+
+        if args.snapshot_out is not None:
+            with metrics.phase("cli.save_snapshot"):
+                save_snapshot(service, args.snapshot_out)
 
-            print(f"{employee_id},{employee_name},{award_id},{net_vested_str}")
+        if ingest_state is not None:
+            ingest_state.record(args.file, end_offset)
+            ingest_state.save()
+
+        with metrics.phase("cli.schedule"), open_output(args.output, compress=args.gzip) as output:
+            writer = ScheduleWriter(output, args.precision)
+            if target_dates is not None:
+                schedules = service.get_vesting_schedules(target_dates, args.precision)
+                for schedule_date, schedule in schedules.items():
+                    writer.write_rows(schedule, schedule_date)
+            else:
+                writer.write_rows(service.get_vesting_schedule(target_date, args.precision))
+            writer.flush()
 
     except CSVParserError as error:
         print(f"Error parsing CSV: {str(error)}", file=sys.stderr)
         sys.exit(1)
 
+    except SnapshotError as error:
+        print(f"Snapshot error: {str(error)}", file=sys.stderr)
+        sys.exit(1)
+
     except VestingValidationError as error:
         print(f"Validation error: {str(error)}", file=sys.stderr)
         sys.exit(1)
     except Exception as error:
         print(f"Unexpected error: {str(error)}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if args.stats:
+            import json
+            print(json.dumps(metrics.report(), indent=2), file=sys.stderr)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,218 @@
+import argparse
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from exceptions.parser_exceptions import CSVParserError
+from exceptions.request_exception import RequestError
+from exceptions.snapshot_exception import SnapshotError
+from exceptions.vesting_exception import VestingValidationError
+from services.snapshot import load_snapshot
+from services.vesting_service import VestingService
+from utils.csv_parser import parse_csv, parse_csv_text
+from utils.date_utils import parse_date
+from utils.vesting_calculator import CALCULATORS, DEFAULT_ENGINE
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+
+class VestingServer:
+    def __init__(self, service: VestingService, default_precision: int = 0):
+        self.service = service
+        self.default_precision = default_precision
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vesting-service")
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _ingest(self, body: bytes, precision: int) -> Dict:
+        events = parse_csv_text(body.decode("utf-8"), precision)
+        self.service.process_events(events)
+        return {"received": len(events)}
+
+    def _precision_option(self, query: Dict[str, List[str]]) -> int:
+        try:
+            precision = int(query.get("precision", [self.default_precision])[0])
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Invalid precision")
+        if not (0 <= precision <= 6):
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Precision must be between 0 and 6, got {precision}")
+        return precision
+
+    def _query_options(self, query: Dict[str, List[str]]) -> Tuple[date, int]:
+        try:
+            target_date = parse_date(query["date"][0])
+        except KeyError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Missing query parameter: date")
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Invalid date, expected YYYY-MM-DD")
+        return target_date, self._precision_option(query)
+
+    @staticmethod
+    def _schedule_rows(schedule) -> List[Dict]:
+        return [
+            {"employee_id": employee_id, "employee_name": employee_name,
+             "award_id": award_id, "net_vested": str(net_vested)}
+            for employee_id, employee_name, award_id, net_vested in schedule
+        ]
+
+    def _employee_schedule(self, employee_id: str, target_date: date, precision: int) -> List[Dict]:
+        if employee_id not in self.service.employees:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown employee: {employee_id}")
+        return self._schedule_rows(self.service.get_employee_schedule(employee_id, target_date, precision))
+
+    def _award_schedule(self, award_id: str, target_date: date, precision: int) -> List[Dict]:
+        rows = self.service.get_award_vesting(award_id, target_date, precision)
+        if not rows:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown award: {award_id}")
+        return self._schedule_rows(rows)
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[HTTPStatus, object]:
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        parts = [part for part in url.path.split("/") if part]
+
+        if method == "GET" and parts == ["health"]:
+            return HTTPStatus.OK, {"status": "ok", "employees": len(self.service.employees)}
+
+        if method == "POST" and parts == ["events"]:
+            precision = self._precision_option(query)
+            return HTTPStatus.OK, await self._run(self._ingest, body, precision)
+
+        if method == "GET" and parts == ["schedule"]:
+            target_date, precision = self._query_options(query)
+            schedule = await self._run(self.service.get_vesting_schedule, target_date, precision)
+            return HTTPStatus.OK, self._schedule_rows(schedule)
+
+        if method == "GET" and len(parts) == 2 and parts[0] == "employees":
+            target_date, precision = self._query_options(query)
+            return HTTPStatus.OK, await self._run(self._employee_schedule, parts[1], target_date, precision)
+
+        if method == "GET" and len(parts) == 2 and parts[0] == "awards":
+            target_date, precision = self._query_options(query)
+            return HTTPStatus.OK, await self._run(self._award_schedule, parts[1], target_date, precision)
+
+        raise RequestError(HTTPStatus.NOT_FOUND, f"No route for {method} {url.path}")
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Malformed request line"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                if "transfer-encoding" in headers:
+                    await self._respond(writer, HTTPStatus.LENGTH_REQUIRED,
+                                        {"error": "Transfer-Encoding is not supported, send Content-Length"}, False)
+                    break
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                        {"error": "Request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, payload = await self.dispatch(method.upper(), target, body)
+                except RequestError as error:
+                    status, payload = error.status, {"error": str(error)}
+                except (CSVParserError, VestingValidationError, ValueError) as error:
+                    status, payload = HTTPStatus.BAD_REQUEST, {"error": str(error)}
+                except Exception as error:
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(error)}
+
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: HTTPStatus, payload, keep_alive: bool) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080,
+                    unix_socket: Optional[str] = None) -> asyncio.AbstractServer:
+        if unix_socket is not None:
+            return await asyncio.start_unix_server(self.handle_connection, path=unix_socket)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+async def _serve_forever(server: VestingServer, host: str, port: int, unix_socket: Optional[str]) -> None:
+    listener = await server.start(host, port, unix_socket)
+    address = unix_socket or "{}:{}".format(*listener.sockets[0].getsockname()[:2])
+    print(f"Serving vesting schedules on {address}", file=sys.stderr)
+    async with listener:
+        await listener.serve_forever()
+
+
+def serve_main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(prog='vesting_schedule serve',
+                                     description='Keep a vesting service resident and answer queries over HTTP')
+    parser.add_argument('--file', default=None, help='CSV file to load at startup')
+    parser.add_argument('--snapshot-in', default=None, help='Snapshot to load at startup')
+    parser.add_argument('--precision', type=int, default=0, help='Default precision for queries and ingest (0-6)')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on (default: 8080)')
+    parser.add_argument('--unix-socket', default=None, help='Listen on a Unix socket instead of TCP')
+    parser.add_argument('--engine', choices=sorted(CALCULATORS), default=DEFAULT_ENGINE,
+                        help=f'Calculator used for vesting totals (default: {DEFAULT_ENGINE})')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.snapshot_in is not None:
+            service = load_snapshot(args.snapshot_in, use_parallel=False, engine=args.engine)
+        else:
+            service = VestingService(use_parallel=False, engine=args.engine)
+        if args.file is not None:
+            service.process_events(parse_csv(args.file, args.precision, use_parallel=False))
+    except (CSVParserError, SnapshotError, VestingValidationError) as error:
+        print(f"Error loading initial state: {str(error)}", file=sys.stderr)
+        sys.exit(1)
+
+    server = VestingServer(service, default_precision=args.precision)
+    try:
+        asyncio.run(_serve_forever(server, args.host, args.port, args.unix_socket))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()